@@ -83,7 +83,8 @@ def run_selected_pipeline(args, smells: list[str], project_path: str, experiment
     Dispatch to the selected pipeline and return the output path.
     """
     if args.pipeline == "haystack":
-        document_store = get_document_store()
+        # The store is only read when RAG is enabled; skip Chroma's start-up otherwise.
+        document_store = get_document_store() if args.use_rag else None
         return run_rag_pipeline(
             args=args,
             smells=smells,
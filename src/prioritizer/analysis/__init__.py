@@ -1,17 +1,24 @@
 # analysis/__init__.py
 from .code_segments import get_code_segment_from_file_based_on_line_number
+from .source_files import read_source
 from .static_metrics import analyze_file
-from .pylint_analysis import get_pylint_metadata, get_pylinter_singleton
-from .llm_reports import build_llm_analysis_report
+from .pylint_analysis import get_pylint_metadata, get_pylint_metadata_batch, get_pylinter_singleton, preload_astroid_modules
+from .llm_reports import build_llm_analysis_report, build_llm_analysis_reports, invalidate_cached_file, score_files
 from .project_structure import build_project_structure
 from .test_coverage import run_coverage_analysis, return_test_coverage_analysis_for_file
 
 __all__ = [
     "get_code_segment_from_file_based_on_line_number",
+    "read_source",
     "analyze_file",
     "get_pylint_metadata",
+    "get_pylint_metadata_batch",
     "get_pylinter_singleton",
+    "preload_astroid_modules",
     "build_llm_analysis_report",
+    "build_llm_analysis_reports",
+    "score_files",
+    "invalidate_cached_file",
     "build_project_structure",
     "run_coverage_analysis",
     "return_test_coverage_analysis_for_file"
@@ -0,0 +1,44 @@
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+from .source_files import read_source_bytes
+
+ANALYSIS_CACHE_DIR = Path("src/prioritizer/data/analysis_cache")
+
+
+def _cache_path(namespace: str, file_path: str, cache_dir: Path) -> Path:
+    """
+    Key a cached result on the tool (namespace, including its version), the path
+    and the file's content, so an edited file or an upgraded tool misses the cache.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{namespace}\0{sys.version_info[:2]}\0{file_path}\0".encode("utf-8"))
+    digest.update(read_source_bytes(file_path))
+    return cache_dir / namespace.split(":", 1)[0] / f"{digest.hexdigest()}.json"
+
+
+def load_cached_result(namespace: str, file_path: str, cache_dir: Path = ANALYSIS_CACHE_DIR) -> Optional[Any]:
+    """Return the result stored by an earlier run for this file, or None."""
+    try:
+        with open(_cache_path(namespace, file_path, cache_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def store_cached_result(namespace: str, file_path: str, result: Any, cache_dir: Path = ANALYSIS_CACHE_DIR) -> None:
+    """
+    Persist `result` for this file. The write goes through a temporary file and a
+    rename, so concurrent workers never leave a half-written entry behind.
+    """
+    path = _cache_path(namespace, file_path, cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,35 @@
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .llm_reports import invalidate_cached_file
+
+
+class _InvalidatingHandler(FileSystemEventHandler):
+    def on_modified(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            invalidate_cached_file(event.src_path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            invalidate_cached_file(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            invalidate_cached_file(event.src_path)
+            invalidate_cached_file(event.dest_path)
+
+
+def start_cache_watcher(root_dir: str) -> Observer:
+    """
+    Watch `root_dir` and evict a file's cached metrics, pylint results and report
+    as soon as it changes on disk.
+
+    The per-file caches are keyed by path only, which is fine for one-shot CLI runs
+    but goes stale in a long-running agent process when files are edited. Call
+    `.stop()` and `.join()` on the returned observer to stop watching.
+    """
+    observer = Observer()
+    observer.schedule(_InvalidatingHandler(), root_dir, recursive=True)
+    observer.daemon = True
+    observer.start()
+    return observer
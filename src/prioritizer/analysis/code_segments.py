@@ -1,6 +1,39 @@
 import ast
 import math
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .source_files import NON_STATEMENT_NODE_TYPES, parse_source, read_source
+
+_ENTITY_TYPES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+
+
+@lru_cache(maxsize=128)
+def _index_source(code: str) -> Tuple[Tuple[str, ...], Dict[int, int]]:
+    """
+    Parse `code` once and return its lines (with line endings) and a map from the
+    start line of every class/function to its end line.
+    """
+    try:
+        tree = parse_source(code)
+    except SyntaxError as e:
+        raise ValueError(f"Invalid Python code: {e}") from e
+
+    entity_end_lines: Dict[int, int] = {}
+    # Only statements can hold a class/function, so expression subtrees are skipped.
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        if type(node) in _ENTITY_TYPES:
+            # Definitions never share a start line, so the first one seen wins.
+            entity_end_lines.setdefault(node.lineno, node.end_lineno)
+        stack.extend(
+            child for child in ast.iter_child_nodes(node)
+            if type(child) not in NON_STATEMENT_NODE_TYPES
+        )
+
+    return tuple(code.splitlines(keepends=True)), entity_end_lines
+
 
 def get_code_segment_from_file_based_on_line_number(start_line: float, file_path: Optional[str] = None, code: Optional[str] = None) -> Optional[str]:
     """
@@ -27,8 +60,7 @@ def get_code_segment_from_file_based_on_line_number(start_line: float, file_path
         raise ValueError("Provide only one of `file_path` or `code`, not both.")
 
     if file_path:
-        with open(file_path, "r", encoding="utf-8") as f:
-            code = f.read()
+        code = read_source(file_path)
     elif code is None:
         raise ValueError("Either `file_path` or `code` must be provided.")
 
@@ -36,23 +68,12 @@ def get_code_segment_from_file_based_on_line_number(start_line: float, file_path
     if isinstance(start_line, float) and math.isnan(start_line):
         return code
 
-    try:
-        tree = ast.parse(code)
-    except SyntaxError as e:
-        raise ValueError(f"Invalid Python code: {e}") from e
-
-    lines = code.splitlines(keepends=True)
+    # Many smells point into the same file, so the parse is shared between calls.
+    lines, entity_end_lines = _index_source(code)
     start_line_int = int(start_line)
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-            if node.lineno == start_line_int:
-                if getattr(node, "end_lineno", None) is not None:
-                    end = node.end_lineno
-                else:
-                    end = max(
-                        getattr(n, "lineno", start_line_int) for n in ast.walk(node)
-                    )
-                return "".join(lines[start_line_int - 1 : end])
-
-    return None
\ No newline at end of file
+    end = entity_end_lines.get(start_line_int)
+    if end is None:
+        return None
+
+    return "".join(lines[start_line_int - 1 : end])
\ No newline at end of file
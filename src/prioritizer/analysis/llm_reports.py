@@ -1,10 +1,37 @@
-from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from .static_metrics import analyze_file
-from .pylint_analysis import get_pylint_metadata, get_pylinter_singleton
+from .source_files import read_source_bytes
+from .static_metrics import _FILE_METRICS_CACHE, analyze_file
+from .pylint_analysis import _PYLINT_RESULTS_CACHE, CollectingReporter, get_pylint_metadata, get_pylint_metadata_batch, get_pylinter_singleton
 
+import numpy as np
+import pandas as pd
 from pylint.lint import PyLinter
-from pylint.reporters.json_reporter import JSONReporter
+
+_REPORT_CACHE: Dict[str, Tuple[bytes, Dict[str, Any]]] = {}
+_PER_FILE_CACHES = (_FILE_METRICS_CACHE, _PYLINT_RESULTS_CACHE, _REPORT_CACHE)
+# Below this many uncached files build_llm_analysis_reports stays in-process.
+_PARALLEL_MIN_FILES = 32
+_FILES_PER_TASK = 8
+
+
+def invalidate_cached_file(file_path: str) -> None:
+    """
+    Drop every in-memory analysis result (metrics, pylint, report) for `file_path`.
+
+    The caches are keyed by the path as the caller passed it (often relative), so
+    entries are matched on their absolute path. Safe to call from another thread,
+    e.g. a file watcher: keys are snapshotted before matching and readers use .get().
+    """
+    target = os.path.abspath(file_path)
+    for cache in _PER_FILE_CACHES:
+        for key in list(cache):
+            if os.path.abspath(key) == target:
+                cache.pop(key, None)
 
 
 def _bucket(value: float, low: float, high: float) -> str:
@@ -94,7 +121,27 @@ def format_llm_file_context_concise(
         f"RISK_SCORE={technical_risk_score:.2f} | FLAGS={','.join(flags) if flags else 'none'} | TOP_ISSUES={top_issues_text}"
     )
 
-def build_llm_analysis_report(file_path: str, reporter: Optional[JSONReporter] = None, linter: Optional[PyLinter] = None,
+def _cached_report(file_path: str) -> Tuple[bytes, Optional[Dict[str, Any]]]:
+    """
+    Return the file's content digest and its cached report, or None if there is no
+    report for this content.
+
+    Agent loops ask for the same file's report repeatedly; while its content is
+    unchanged the previous report is returned as is.
+    """
+    digest = hashlib.blake2b(read_source_bytes(file_path), digest_size=16).digest()
+    cached = _REPORT_CACHE.get(file_path)
+    if cached is not None:
+        if cached[0] == digest:
+            return digest, cached[1]
+        # The file changed since its last report. The metric and pylint caches are
+        # keyed by path only, so drop their entries too or they would be reused.
+        _FILE_METRICS_CACHE.pop(file_path, None)
+        _PYLINT_RESULTS_CACHE.pop(file_path, None)
+    return digest, None
+
+
+def build_llm_analysis_report(file_path: str, reporter: Optional[CollectingReporter] = None, linter: Optional[PyLinter] = None,
 ) -> Dict[str, Any]:
     """
     Combine Radon, AST, and Pylint results into an LLM-friendly analysis summary.
@@ -116,6 +163,10 @@ def build_llm_analysis_report(file_path: str, reporter: Optional[JSONReporter] =
     if not file_path:
         return {"text": "An invalid filepath was provided.", "meta": {}}
 
+    digest, cached = _cached_report(file_path)
+    if cached is not None:
+        return cached
+
     meta = analyze_file(file_path)
 
     if linter is None or reporter is None:
@@ -140,7 +191,7 @@ def build_llm_analysis_report(file_path: str, reporter: Optional[JSONReporter] =
 
     summary_text = format_llm_file_context_concise(meta, pylint_summary, pylint_msgs, technical_risk_score)
 
-    return {
+    report = {
         "text": summary_text,
         "meta": {
             "file": meta["file"],
@@ -156,3 +207,87 @@ def build_llm_analysis_report(file_path: str, reporter: Optional[JSONReporter] =
             "technical_risk_score": technical_risk_score,
         },
     }
+
+    _REPORT_CACHE[file_path] = (digest, report)
+    return report
+
+
+
+def _build_reports_serial(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Reports for `file_paths`, in order, from one pylint run over all of them.
+
+    Also the worker entry point of `build_llm_analysis_reports`: each worker process
+    creates its linter singleton on its first chunk and keeps it for the rest.
+    """
+    linter, reporter = get_pylinter_singleton()
+    # One pylint run over all files fills the cache the per-file reports read from,
+    # and astroid parses the modules they share once.
+    get_pylint_metadata_batch(file_paths, reporter, linter)
+    return [build_llm_analysis_report(path, reporter, linter) for path in file_paths]
+
+
+def build_llm_analysis_reports(file_paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run `build_llm_analysis_report` over many files, fanning large inputs out to a
+    process pool.
+
+    Pylint and radon are CPU-bound and the shared PyLinter is not thread-safe, so
+    with at least `_PARALLEL_MIN_FILES` uncached files each worker process gets
+    chunks of files and runs them through `get_pylint_metadata_batch`, like the
+    serial path does. Below that, starting workers (a fresh interpreter plus the
+    pylint/astroid imports and linter setup each) costs more than it saves. Reports
+    built in workers are stored in this process's cache as well, and workers write
+    to the same on-disk analysis cache, so later calls and runs reuse them.
+
+    Returns:
+        A dict mapping each (deduplicated) path to its report, in input order.
+    """
+    paths = list(dict.fromkeys(file_paths))
+
+    reports: Dict[str, Dict[str, Any]] = {}
+    digests: Dict[str, bytes] = {}
+    for path in paths:
+        if not path:
+            reports[path] = build_llm_analysis_report(path)
+            continue
+        digests[path], cached = _cached_report(path)
+        if cached is not None:
+            reports[path] = cached
+    pending = [p for p in paths if p not in reports]
+
+    workers = min(max_workers or os.cpu_count() or 1, -(-len(pending) // _FILES_PER_TASK))
+    if len(pending) < _PARALLEL_MIN_FILES or workers <= 1:
+        built = _build_reports_serial(pending) if pending else []
+    else:
+        # Several files per task, so each worker's batched pylint run covers more
+        # than one file, but no more than an even share so the workers stay balanced.
+        size = min(_FILES_PER_TASK, -(-len(pending) // workers))
+        chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+
+        # Spawned rather than forked workers: callers run this next to git mining
+        # threads, and forking a multi-threaded process can deadlock the child.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            built = [report for chunk_reports in pool.map(_build_reports_serial, chunks) for report in chunk_reports]
+
+    for path, report in zip(pending, built):
+        _REPORT_CACHE[path] = (digests[path], report)
+        reports[path] = report
+
+    return {path: reports[path] for path in paths}
+
+
+def score_files(metrics: pd.DataFrame) -> np.ndarray:
+    """
+    Technical risk score for many files at once.
+
+    `metrics` holds one row per file with the columns of a report's 'meta' dict
+    (e.g. `pd.DataFrame([r["meta"] for r in reports.values()])`). The result matches
+    the per-file 'technical_risk_score', computed as whole-column array operations.
+    """
+    avg_cc = metrics["avg_cc"].to_numpy(dtype=np.float64)
+    mi = metrics["maintainability_index"].to_numpy(dtype=np.float64)
+    refactor = metrics["pylint_refactor"].to_numpy(dtype=np.float64)
+    warning = metrics["pylint_warning"].to_numpy(dtype=np.float64)
+
+    return avg_cc / 10 + (100 - mi) / 20 + refactor * 0.5 + warning * 0.5
@@ -1,5 +1,5 @@
 import os
-from typing import Set
+from typing import List, Set
 
 EXCLUDE_DIRS: Set[str] = {
     ".git",
@@ -10,21 +10,49 @@ EXCLUDE_DIRS: Set[str] = {
     ".mypy_cache",
 }
 
+_INDENT = "│   "
+# Indent prefixes for the usual nesting depths, built once instead of per directory.
+_INDENTS = tuple(_INDENT * depth for depth in range(32))
+
+
+def _walk_structure(path: str, depth: int, structure: List[str]) -> None:
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        # Unreadable directories are left out, as os.walk does.
+        return
+
+    indent_str = _INDENTS[depth] if depth < len(_INDENTS) else _INDENT * depth
+    structure.append(f"{indent_str}├── {os.path.basename(path)}/")
+
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if not is_dir:
+            structure.append(f"{indent_str}│   ├── {entry.name}")
+        # Symlinked directories are listed as directories but not followed.
+        elif entry.name not in EXCLUDE_DIRS and not entry.is_symlink():
+            subdirs.append(entry.path)
+
+    for subdir in subdirs:
+        _walk_structure(subdir, depth + 1, structure)
+
+
 def build_project_structure(root_dir) -> str:
     """
     Build a simple textual tree of the project under `root_dir`.
 
     Excludes common transient/virtual directories (venv, .git, etc.).
     """
-    structure = []
-    for root, dirs, files in os.walk(root_dir):
-        dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
-
-        level = root.replace(root_dir, "").count(os.sep)
-        indent_str = "│   " * level
-        structure.append(f"{indent_str}├── {os.path.basename(root)}/")
-        for f in files:
-            structure.append(f"{indent_str}│   ├── {f}")
+    structure: List[str] = []
+    # A direct scandir walk: the depth is tracked as we descend rather than
+    # recovered from each path, and the entries' cached type bits avoid extra stats.
+    _walk_structure(os.fspath(root_dir), 0, structure)
     return "\n".join(structure)
 
 
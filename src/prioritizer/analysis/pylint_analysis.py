@@ -1,20 +1,44 @@
-import json
-from io import StringIO
-from typing import Any, Dict, List, Optional, Tuple
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+import astroid
+import pylint
 from pylint.lint import PyLinter
-from pylint.reporters.json_reporter import JSONReporter
+from pylint.message import Message
+from pylint.reporters.base_reporter import BaseReporter
 
+from .analysis_cache import load_cached_result, store_cached_result
 from .astroid_patches import patch_astroid_namespace_bug
 
 patch_astroid_namespace_bug()
 
 _PYLINT_RESULTS_CACHE: Dict[str, Tuple[Dict[str, int], List[Dict[str, Any]]]] = {}
-_PYLINTER_SINGLETON: Optional[Tuple[PyLinter, JSONReporter]] = None
+_PYLINTER_SINGLETON: Optional[Tuple[PyLinter, "CollectingReporter"]] = None
+# Inference comes from astroid, so its version is part of the key as well as pylint's.
+_DISK_CACHE_NAMESPACE = f"pylint:pylint-{pylint.__version__}-astroid-{astroid.__version__}:collected"
+_CROSS_FILE_MESSAGES = ("duplicate-code", "cyclic-import")
+_SUMMARY_CATEGORIES = ("convention", "refactor", "warning", "error", "fatal")
+_SUMMARY_CATEGORY_LETTERS = "CRWEF"
 
-def get_pylinter_singleton() -> Tuple[PyLinter, JSONReporter]:
+
+class CollectingReporter(BaseReporter):
+    """
+    Reporter that only keeps pylint's `Message` objects.
+
+    Callers read `messages` straight after `linter.check`, with no JSON written and
+    parsed in between; clear it before each check.
+    """
+
+    name = "collecting"
+
+    def _display(self, layout) -> None:
+        pass
+
+
+def get_pylinter_singleton() -> Tuple[PyLinter, CollectingReporter]:
     """
-    Lazily create and cache a PyLinter + JSONReporter instance.
+    Lazily create and cache a PyLinter + CollectingReporter instance.
 
     This avoids paying plugin loading + configuration cost on every call.
     """
@@ -22,7 +46,7 @@ def get_pylinter_singleton() -> Tuple[PyLinter, JSONReporter]:
     if _PYLINTER_SINGLETON is not None:
         return _PYLINTER_SINGLETON
 
-    reporter = JSONReporter()
+    reporter = CollectingReporter()
     linter = PyLinter(reporter=reporter)
 
     linter.load_default_plugins()
@@ -38,46 +62,144 @@ def get_pylinter_singleton() -> Tuple[PyLinter, JSONReporter]:
     _PYLINTER_SINGLETON = (linter, reporter)
     return _PYLINTER_SINGLETON
     
-def get_pylint_metadata(
-    file_path: str, reporter: JSONReporter, linter: PyLinter
-) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+def preload_astroid_modules(module_names: Iterable[str]) -> List[str]:
     """
-    Run pylint on a single file and return a summary and a simplified list of messages.
+    Parse and cache the given modules in astroid's process-wide manager.
 
-    Results are cached per file to avoid duplicate analysis.
-    """
-    if file_path in _PYLINT_RESULTS_CACHE:
-        return _PYLINT_RESULTS_CACHE[file_path]
+    The linter singleton already keeps that cache warm between `linter.check` calls;
+    this lets a long-lived caller pay for heavy imports (e.g. numpy, pandas) up front
+    instead of inside the first file's analysis. Modules that cannot be found or
+    built are skipped.
 
-    reporter._output = StringIO()
-    linter.check([file_path])
+    Returns:
+        The names of the modules that were loaded.
+    """
+    loaded: List[str] = []
+    for name in module_names:
+        try:
+            astroid.MANAGER.ast_from_module_name(name)
+        except astroid.AstroidBuildingError:
+            continue
+        loaded.append(name)
+    return loaded
 
-    raw = reporter._output.getvalue() or "[]"
-    results = json.loads(raw)
 
-    summary = {
-        "convention": 0,
-        "refactor": 0,
-        "warning": 0,
-        "error": 0,
-        "fatal": 0,
-    }
+def _summarize_messages(messages: List[Message]) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    # One counter slot per category, indexed by the message's category letter
+    # (msg.C); info messages ("I") are not counted.
+    counts = [0] * len(_SUMMARY_CATEGORIES)
 
     simplified_results: List[Dict[str, Any]] = []
-    for msg in results:
-        msg_type = msg.get("type", "")
-        if msg_type in summary:
-            summary[msg_type] += 1
+    for msg in messages:
+        slot = _SUMMARY_CATEGORY_LETTERS.find(msg.C)
+        if slot >= 0:
+            counts[slot] += 1
 
         simplified_results.append(
             {
-                "type": msg_type,
-                "module": msg.get("module"),
-                "line": msg.get("line"),
-                "path": msg.get("path"),
-                "message": msg.get("message"),
+                "type": msg.category,
+                "module": msg.module,
+                "line": msg.line,
+                "path": msg.path,
+                "message": msg.msg,
             }
         )
 
+    return dict(zip(_SUMMARY_CATEGORIES, counts)), simplified_results
+
+
+def _load_cached_metadata(file_path: str) -> Optional[Tuple[Dict[str, int], List[Dict[str, Any]]]]:
+    # A single .get(): the cache watcher may evict entries from another thread.
+    cached = _PYLINT_RESULTS_CACHE.get(file_path)
+    if cached is not None:
+        return cached
+
+    cached = load_cached_result(_DISK_CACHE_NAMESPACE, file_path)
+    if cached is None:
+        return None
+
+    summary, simplified_results = cached
+    _PYLINT_RESULTS_CACHE[file_path] = (summary, simplified_results)
+    return summary, simplified_results
+
+
+def _store_metadata(
+    file_path: str, summary: Dict[str, int], simplified_results: List[Dict[str, Any]]
+) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
     _PYLINT_RESULTS_CACHE[file_path] = (summary, simplified_results)
-    return summary, simplified_results
\ No newline at end of file
+    store_cached_result(_DISK_CACHE_NAMESPACE, file_path, [summary, simplified_results])
+    return summary, simplified_results
+
+
+def get_pylint_metadata(
+    file_path: str, reporter: CollectingReporter, linter: PyLinter
+) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+    """
+    Run pylint on a single file and return a summary and a simplified list of messages.
+
+    Results are cached per file to avoid duplicate analysis, in memory and on disk
+    keyed by the file's content, so unchanged files skip pylint on later runs.
+
+    The disk key covers this file's content only. Messages that depend on inference
+    into imported modules (e.g. no-member, import-error) can go stale when those
+    modules change while this file does not; clear the analysis cache in that case.
+    """
+    cached = _load_cached_metadata(file_path)
+    if cached is not None:
+        return cached
+
+    reporter.messages = []
+    linter.check([file_path])
+
+    summary, simplified_results = _summarize_messages(reporter.messages)
+
+    _store_metadata(file_path, summary, simplified_results)
+    return summary, simplified_results
+
+
+def get_pylint_metadata_batch(
+    file_paths: Iterable[str], reporter: CollectingReporter, linter: PyLinter
+) -> Dict[str, Tuple[Dict[str, int], List[Dict[str, Any]]]]:
+    """
+    Same as `get_pylint_metadata` for many files, but with one `linter.check` call
+    over all uncached files, so astroid parses shared imports once.
+
+    Messages are split back per file by path. Results land in the same caches, so a
+    later `get_pylint_metadata` call for any of these files is a lookup.
+    """
+    paths = list(dict.fromkeys(file_paths))
+
+    # Results are collected locally rather than read back from the shared cache,
+    # which the cache watcher may evict from at any time.
+    results: Dict[str, Tuple[Dict[str, int], List[Dict[str, Any]]]] = {}
+    pending: List[str] = []
+    for path in paths:
+        cached = _load_cached_metadata(path)
+        if cached is None:
+            pending.append(path)
+        else:
+            results[path] = cached
+
+    if pending:
+        # These checks only fire across the files of one run; turn them off so every
+        # file gets the same messages a single-file check would give it.
+        cross_file = [m for m in _CROSS_FILE_MESSAGES if linter.is_message_enabled(m)]
+        for msg_id in cross_file:
+            linter.disable(msg_id)
+
+        reporter.messages = []
+        try:
+            linter.check(pending)
+        finally:
+            for msg_id in cross_file:
+                linter.enable(msg_id)
+
+        messages_by_path: Dict[str, List[Message]] = defaultdict(list)
+        for msg in reporter.messages:
+            messages_by_path[msg.abspath].append(msg)
+
+        for file_path in pending:
+            summary, simplified_results = _summarize_messages(messages_by_path[os.path.abspath(file_path)])
+            results[file_path] = _store_metadata(file_path, summary, simplified_results)
+
+    return {p: results[p] for p in paths}
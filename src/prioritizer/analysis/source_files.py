@@ -0,0 +1,64 @@
+import ast
+import os
+from functools import lru_cache
+from pathlib import Path
+
+# Node types that can never contain a class, function or import: expressions and
+# the helper nodes hanging off them. Statements only nest inside other statements
+# (and except handlers / match cases), so AST passes looking for definitions do
+# not need to descend into these subtrees.
+NON_STATEMENT_NODE_TYPES = frozenset(
+    node_type
+    for base in (ast.expr, ast.expr_context, ast.boolop, ast.operator, ast.unaryop, ast.cmpop, ast.pattern)
+    for node_type in base.__subclasses__()
+) | frozenset((ast.arguments, ast.arg, ast.keyword, ast.alias, ast.comprehension, ast.withitem))
+
+
+@lru_cache(maxsize=256)
+def _read_bytes(file_path: str, mtime_ns: int, size: int) -> bytes:
+    # mtime_ns and size are only part of the cache key, so an edited file is read again.
+    return Path(file_path).read_bytes()
+
+
+def read_source_bytes(file_path: str | Path) -> bytes:
+    """
+    Return the raw bytes of `file_path`.
+
+    Static metrics, pylint, the analysis cache key and code-segment extraction all
+    look at the same files, so the contents are kept in a small LRU keyed on the
+    file's mtime and size and each file is read from disk once per change.
+    """
+    file_path = os.fspath(file_path)
+    stat = os.stat(file_path)
+    return _read_bytes(file_path, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=256)
+def _decode_source(data: bytes) -> str:
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def read_source(file_path: str | Path) -> str:
+    """
+    Read a UTF-8 Python source file.
+
+    The bytes are decoded in one step, without going through the text I/O layer.
+    Line endings are then normalized to "\\n", the same way text mode does, so
+    offsets and line splits match what `open(..., encoding="utf-8")` produced.
+    Both the bytes and the decoded text are cached (see `read_source_bytes`).
+    """
+    return _decode_source(read_source_bytes(file_path))
+
+
+@lru_cache(maxsize=64)
+def parse_source(code: str) -> ast.Module:
+    """
+    Parse `code`, sharing the tree between every analysis of the same source.
+
+    Static metrics and code-segment extraction usually look at the same file, so
+    this keeps it to one parse. Callers must treat the returned tree as read-only.
+    """
+    return ast.parse(code)
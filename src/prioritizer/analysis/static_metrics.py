@@ -1,14 +1,114 @@
 import ast
-from typing import Any, Dict, List
+import io
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
-import radon.complexity as radon_cc
+import radon
 import radon.metrics as radon_metrics
+import radon.raw as radon_raw
+from radon.visitors import ComplexityVisitor
+
+from .analysis_cache import load_cached_result, store_cached_result
+from .source_files import NON_STATEMENT_NODE_TYPES, parse_source, read_source
 
 _FILE_METRICS_CACHE: Dict[str, Dict[str, Any]] = {}
+# The suffix marks the result format; bump it when analyze_file output changes so
+# entries written by an older version are not reused.
+_DISK_CACHE_NAMESPACE = f"static_metrics:radon-{radon.__version__}:exact-mean"
 
 def _read_code(file_path: str) -> str:
-    with open(file_path, "r", encoding="utf-8") as f:
-        return f.read()
+    return read_source(file_path)
+
+
+def _collect_nodes(tree: ast.AST) -> Tuple[List[ast.ClassDef], int, int]:
+    """
+    Single pre-order pass over `tree`.
+
+    Returns the class nodes in source order, the number of function definitions and
+    the number of import statements.
+    """
+    class_nodes: List[ast.ClassDef] = []
+    num_functions = 0
+    num_imports = 0
+
+    # Explicit stack rather than recursion: deeply nested expressions would
+    # otherwise hit the interpreter's recursion limit.
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        # Exact type checks: none of these node classes are subclassed, so this
+        # matches isinstance without walking the MRO for every node.
+        node_type = type(node)
+        if node_type is ast.ClassDef:
+            class_nodes.append(node)
+        elif node_type is ast.FunctionDef:
+            num_functions += 1
+        elif node_type is ast.Import or node_type is ast.ImportFrom:
+            num_imports += 1
+
+        children = [child for child in ast.iter_child_nodes(node) if type(child) not in NON_STATEMENT_NODE_TYPES]
+        children.reverse()
+        stack.extend(children)
+
+    return class_nodes, num_functions, num_imports
+
+
+@lru_cache(maxsize=4096)
+def _raw_chunk_metrics(chunk: str) -> radon_raw.Module:
+    return radon_raw.analyze(chunk)
+
+
+def _raw_metrics(code: str, tree: ast.Module) -> radon_raw.Module:
+    """
+    Same result as `radon.raw.analyze(code)`, computed per top-level statement.
+
+    Radon's raw metrics are by far the most expensive part of `analyze_file` and
+    they add up across chunks split at top-level statement boundaries. Each chunk's
+    metrics are memoized on its text, so when a file is edited only the changed
+    functions/classes are tokenized again.
+    """
+    # Split on "\n" only; str.splitlines would also split on form feeds and the
+    # like, which the AST line numbers do not count.
+    lines = io.StringIO(code).readlines()
+
+    # A statement may start on the line where the previous one ends
+    # (`x = f(a,\n b); y = 3`); such statements stay in the same chunk, since
+    # cutting at that line would split the previous statement in half.
+    bounds = [1]
+    prev_end = 0
+    for node in tree.body:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", ())])
+        if start > prev_end and start > bounds[-1]:
+            bounds.append(start)
+        prev_end = max(prev_end, node.end_lineno or node.lineno)
+    bounds.append(len(lines) + 1)
+
+    totals = [0] * len(radon_raw.Module._fields)
+    try:
+        for start, end in zip(bounds, bounds[1:]):
+            chunk_metrics = _raw_chunk_metrics("".join(lines[start - 1 : end - 1]))
+            for i, value in enumerate(chunk_metrics):
+                totals[i] += value
+    except SyntaxError:
+        # A chunk radon cannot tokenize on its own; the whole file always works.
+        return radon_raw.analyze(code)
+    return radon_raw.Module(*totals)
+
+
+def _maintainability_index(code: str, tree: ast.Module, total_complexity: int, count_multi: bool = True) -> float:
+    """
+    Same result as `radon.metrics.mi_visit(code, count_multi)`, but reusing the
+    already-parsed tree and complexity total instead of parsing the code again.
+    """
+    raw = _raw_metrics(code, tree)
+    comment_lines = raw.comments + (raw.multi if count_multi else 0)
+    comments = comment_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+    return radon_metrics.mi_compute(
+        radon_metrics.h_visit_ast(tree).total.volume,
+        total_complexity,
+        raw.lloc,
+        comments,
+    )
 
 
 def analyze_file(file_path: str) -> Dict[str, Any]:
@@ -16,7 +116,8 @@ def analyze_file(file_path: str) -> Dict[str, Any]:
     Compute static, file-level metrics using AST and Radon.
 
     This function is relatively expensive but deterministic for a given file.
-    Per-file results are cached to avoid recomputation.
+    Per-file results are cached in memory, and on disk keyed by the file's content,
+    so unchanged files are not analyzed again on later runs.
 
     Returns:
         A dict with keys:
@@ -24,45 +125,65 @@ def analyze_file(file_path: str) -> Dict[str, Any]:
           - avg_cc, max_cc, cc_std, maintainability_index
           - classes: list of per-class metrics
     """
-    if file_path in _FILE_METRICS_CACHE:
-        return _FILE_METRICS_CACHE[file_path]
+    # A single .get(): the cache watcher may evict entries from another thread.
+    cached = _FILE_METRICS_CACHE.get(file_path)
+    if cached is not None:
+        return cached
+
+    cached = load_cached_result(_DISK_CACHE_NAMESPACE, file_path)
+    if cached is not None:
+        _FILE_METRICS_CACHE[file_path] = cached
+        return cached
 
     code = _read_code(file_path)
-    tree = ast.parse(code)
+    tree = parse_source(code)
     lines = len(code.splitlines())
 
     # Basic counts
-    num_classes = sum(1 for n in ast.walk(tree) if isinstance(n, ast.ClassDef))
-    num_functions = sum(1 for n in ast.walk(tree) if isinstance(n, ast.FunctionDef))
-    num_imports = sum(1 for n in ast.walk(tree) if isinstance(n, (ast.Import, ast.ImportFrom)))
+    class_nodes, num_functions, num_imports = _collect_nodes(tree)
+    num_classes = len(class_nodes)
 
-    # Radon CC
-    cc_scores = radon_cc.cc_visit(code)
+    # Radon CC, computed on the tree parsed above rather than re-parsing the code
+    complexity = ComplexityVisitor.from_ast(tree)
+    cc_scores = complexity.blocks
     if cc_scores:
-        complexities = [c.complexity for c in cc_scores]
-        avg_cc = sum(complexities) / len(complexities)
-        max_cc = max(complexities)
-        cc_std = (sum((c - avg_cc) ** 2 for c in complexities) / len(complexities)) ** 0.5
+        # Mean, max and population std in one pass. The mean comes from an integer
+        # total so it is exact (the CC flags compare it against whole thresholds);
+        # Welford's update is used only for the spread.
+        count = 0
+        total = 0
+        running_mean = 0.0
+        sq_dev_sum = 0.0
+        max_cc = 0
+        for block in cc_scores:
+            cc = block.complexity
+            count += 1
+            total += cc
+            delta = cc - running_mean
+            running_mean += delta / count
+            sq_dev_sum += delta * (cc - running_mean)
+            if cc > max_cc:
+                max_cc = cc
+        avg_cc = total / count
+        cc_std = (sq_dev_sum / count) ** 0.5
     else:
         avg_cc = max_cc = cc_std = 0.0
 
-    maintainability_index = radon_metrics.mi_visit(code, True)
+    maintainability_index = _maintainability_index(code, tree, complexity.total_complexity)
 
     # Per-class metrics (for potential future use)
     classes: List[Dict[str, Any]] = []
-    for c in (n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)):
+    for c in class_nodes:
         methods = [n for n in c.body if isinstance(n, ast.FunctionDef)]
+        # Line spans come straight from the node positions; slicing the source with
+        # get_source_segment re-splits the whole file for every node.
         if methods:
-            method_lengths = [
-                len(ast.get_source_segment(code, m).splitlines())  # type: ignore[arg-type]
-                for m in methods
-            ]
+            method_lengths = [m.end_lineno - m.lineno + 1 for m in methods]
             avg_method_len = sum(method_lengths) / len(method_lengths)
         else:
             avg_method_len = 0
 
-        class_src = ast.get_source_segment(code, c)  # type: ignore[arg-type]
-        total_lines = len(class_src.splitlines()) if class_src is not None else 0
+        total_lines = c.end_lineno - c.lineno + 1
 
         classes.append(
             {
@@ -87,4 +208,6 @@ def analyze_file(file_path: str) -> Dict[str, Any]:
     }
 
     _FILE_METRICS_CACHE[file_path] = meta
+    store_cached_result(_DISK_CACHE_NAMESPACE, file_path, meta)
     return meta
+
@@ -83,6 +83,14 @@ def build_parser() -> argparse.ArgumentParser:
         help="Use AI summaries of code segments or embed the raw code snippets directly."
     )
 
+    parser.add_argument(
+        "--summary-batch-size",
+        dest="summary_batch_size",
+        type=int,
+        default=1,
+        help="Number of code segments summarized per LLM call when --code-context=analysis.",
+    )
+
     parser.add_argument(
         "--rag",
         dest="use_rag",
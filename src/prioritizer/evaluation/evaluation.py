@@ -1,3 +1,4 @@
+import csv
 import pandas as pd
 from io import StringIO
 from scipy.stats import kendalltau, spearmanr
@@ -89,12 +90,12 @@ def ndcg_ranking_using_only_id(gt_ids: Sequence[str], llm_ids: Sequence[str]) ->
     """
     rel = {id_: len(gt_ids) - i for i, id_ in enumerate(gt_ids)} 
 
+    # log2(i + 2) discounts for positions 0..len(gt_ids)-1, shared by DCG and IDCG.
+    discounts = np.log2(np.arange(2, len(gt_ids) + 2, dtype=np.float64))
+
     def dcg(ids: Sequence[str]) -> float:
-        score = 0.0
-        for i, id_ in enumerate(ids):
-            r = rel.get(id_, 0)
-            score += gain(r) / np.log2(i + 2)
-        return score
+        rels = np.fromiter((rel.get(id_, 0) for id_ in ids), dtype=np.float64, count=len(ids))
+        return float(np.sum(gain(rels) / discounts[: len(ids)]))
 
     dcg_pred = dcg(llm_ids[: len(gt_ids)])
 
@@ -182,6 +183,7 @@ _NORMALIZE_CHARS = str.maketrans({
 
 _CODE_FENCE_START = re.compile(r"(?s)^.*?```[a-zA-Z]*\s*")
 _CODE_FENCE_END = re.compile(r"\s*```.*$")
+_MARKDOWN_SEPARATOR = re.compile(r"^-+\|(-+\|?)+$")
 
 
 def _strip_code_fences(text: str) -> str:
@@ -207,7 +209,7 @@ def _clean_lines(text: str) -> str:
         line = line.strip()
         if not line:
             continue
-        if re.match(r"^-+\|(-+\|?)+$", line):  # markdown table separators
+        if _MARKDOWN_SEPARATOR.match(line):  # markdown table separators
             continue
         if line.lower().startswith("rank|") and cleaned and "rank|" in cleaned[0].lower():
             continue  # skip duplicate header
@@ -238,9 +240,20 @@ def _drop_embedded_header_rows(df: pd.DataFrame) -> pd.DataFrame:
 
     return df
 
+def _read_llm_output(llm_output: str | Path) -> str:
+    """
+    Accept either the LLM output itself or a path to the file holding it.
+
+    A `Path` is read as a file; a `str` is always the output text itself. Callers
+    holding a filename in a `str` must wrap it in `Path(...)`.
+    """
+    if isinstance(llm_output, Path):
+        return llm_output.read_text(encoding="utf-8")
+    return llm_output
+
+
 def format_output_from_llm_to_csv_format(llm_output: str | Path) -> pd.DataFrame:
-    llm_output = Path(llm_output)
-    raw_text = llm_output.read_text(encoding="utf-8")
+    raw_text = _read_llm_output(llm_output)
 
     text = _strip_code_fences(raw_text)
     text = text.translate(_NORMALIZE_CHARS).replace('""', '"').strip()
@@ -252,7 +265,9 @@ def format_output_from_llm_to_csv_format(llm_output: str | Path) -> pd.DataFrame
 
     for header_setting in (0, None):
         try:
-            df = pd.read_csv(StringIO(text), sep=r"\|", engine="python", header=header_setting)
+            # QUOTE_NONE: cells are never CSV-quoted, and a stray '"' in a Name or
+            # Reason must not start a quoted field (_finalize_df trims wrapping quotes).
+            df = pd.read_csv(StringIO(text), sep="|", engine="c", header=header_setting, quoting=csv.QUOTE_NONE)
             df = _finalize_df(df)
 
             if set(EXPECTED_COLS).issubset(set(df.columns)):
@@ -286,7 +301,8 @@ def _load_ground_truth_df(ground_truth: str | Path) -> pd.DataFrame:
 
 
 def ranking_computation(ground_truth: str | Path,llm_output: str | Path) -> Optional[dict]:
-    llm_df = format_output_from_llm_to_csv_format(llm_output)
+    # `llm_output` is a filename here; a bare str would be parsed as the output text.
+    llm_df = format_output_from_llm_to_csv_format(Path(llm_output))
     gt_df = _load_ground_truth_df(ground_truth)
 
     llm_df = _normalize_eval_df(llm_df)
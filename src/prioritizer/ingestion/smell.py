@@ -0,0 +1,33 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class Smell:
+    """
+    A single detected code smell plus the context gathered for it along the pipeline.
+
+    The first block of fields comes straight from the detector report; the optional
+    fields are filled in by later stages (git/pylint/coverage context, code segments,
+    AI summaries and RAG evidence) and stay None when a stage is disabled.
+    """
+    index: int
+    type_of_smell: str
+    name: str
+    file_path: str
+    module_or_class: Optional[str] = None
+    line_number: Any = None
+    description: Optional[str] = None
+
+    git_analysis: Optional[str] = None
+    pylint_report: Optional[str] = None
+    test_coverage_report: Optional[str] = None
+    code_segment: Optional[str] = None
+    ai_code_segment_summary: Optional[str] = None
+
+    rag_results: Optional[List[Dict[str, Any]]] = None
+    rag_query: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict copy of the smell, for JSON output and other dict-based consumers."""
+        return asdict(self)
@@ -1,91 +1,114 @@
-from prioritizer.analysis import get_code_segment_from_file_based_on_line_number, build_llm_analysis_report, return_test_coverage_analysis_for_file
+from prioritizer.analysis import get_code_segment_from_file_based_on_line_number, build_llm_analysis_reports, return_test_coverage_analysis_for_file, read_source
 from prioritizer.history.git_file_data_retrieval import build_git_input_for_llm
+from prioritizer.ingestion.smell import Smell
+
+import math
+import random
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import pandas as pd
 from git import Repo
-import random
-import json
+import orjson
 from typing import List, Any
 
-def read_and_store_relevant_smells(smell_filter: List[str]) ->  List[dict[str, Any]]: 
+SMELL_REPORT_COLUMNS = ["Type", "Name", "File", "Module/Class", "Line Number", "Description"]
+
+def read_and_store_relevant_smells(smell_filter: List[str]) ->  List[Smell]: 
     df = pd.read_csv("python_smells_detector/code_quality_report.csv")
-    docs: List[dict[str, Any]] = []
-
-    i = 1
-
-    for _, row in df.iterrows():
-        if row["Name"] not in smell_filter:
-            continue
-        
-        code_smell = {
-            "index": i,
-            "type_of_smell": row["Type"],
-            "name": row["Name"],
-            "file_path": row["File"],
-            "module_or_class": row["Module/Class"],
-            "line_number": row["Line Number"],
-            "description": row["Description"],
-        }
-            
-        docs.append(code_smell)
+    sub = df.loc[df["Name"].isin(smell_filter), SMELL_REPORT_COLUMNS]
+
+    # Indices are assigned in report order, then the presentation order is shuffled
+    # deterministically so the LLM does not see smells grouped by detector output.
+    # A private Random(42) gives the same order as the original seed(42)/shuffle
+    # without touching the global random state.
+    perm = list(range(len(sub)))
+    random.Random(42).shuffle(perm)
+    sub = sub.iloc[perm]
+
+    docs: List[Smell] = [
+        Smell(
+            index=pos + 1,
+            type_of_smell=type_of_smell,
+            name=name,
+            file_path=file_path,
+            module_or_class=module_or_class,
+            line_number=line_number,
+            description=description,
+        )
+        for pos, (type_of_smell, name, file_path, module_or_class, line_number, description)
+        in zip(perm, sub.itertuples(index=False, name=None))
+    ]
 
-        i += 1
+    return docs
 
-    random.seed(42)
-    random.shuffle(docs)
+def _resolve_smell_paths(project_name: str, file_path: str) -> tuple[str, str]:
+    """Return (path on disk, path relative to the project repo) for a smell's File column."""
+    if file_path.startswith("../"):
+        return file_path[3:], file_path.split(project_name+"/")[-1]
+    return file_path, file_path
 
-    return docs
 
 def add_further_context(
         project_name: str, 
-        code_smells: List[dict], 
+        code_smells: List[Smell], 
         git_stats: bool = True, 
         pylint: bool = True, 
         code_segment: bool = True,
         test_coverage: bool = True,
-    ) -> List[dict]:
+    ) -> List[Smell]:
+
+    resolved = [_resolve_smell_paths(project_name, smell.file_path) for smell in code_smells]
 
     git_cache: dict[str, str] = {}
     pylint_cache: dict[str, str] = {}
     code_cache: dict[tuple[str, int], str] = {}
+    source_cache: dict[str, str] = {}
+
+    git_files = {file_path for _, file_path in resolved} if git_stats else set()
+
+    # Git mining walks the whole history once per file and spends most of its time in
+    # git subprocesses, so the files are mined concurrently. Pylint shares a single
+    # PyLinter instance per process and is not thread-safe; the reports are built on
+    # the calling thread (fanned out to worker processes when there are several
+    # cores) while the git reports are being built.
+    with ThreadPoolExecutor(max_workers=max(1, min(16, len(git_files)))) as pool:
+        git_futures = {
+            file_path: pool.submit(build_git_input_for_llm, project_name, file_path)
+            for file_path in git_files
+        }
 
-    for smell in code_smells:
-        file_path = smell["file_path"]
-        line_number = smell["line_number"]
+        if pylint:
+            reports = build_llm_analysis_reports(normalized_path for normalized_path, _ in resolved)
+            pylint_cache = {path: report["text"] for path, report in reports.items()}
+
+        for file_path, future in git_futures.items():
+            git_cache[file_path] = future.result()
 
-        if file_path.startswith("../"):
-            normalized_path = file_path[3:]
-            file_path = file_path.split(project_name+"/")[-1]
-        else:
-            normalized_path = file_path
+    for smell, (normalized_path, file_path) in zip(code_smells, resolved):
+        line_number = smell.line_number
 
         if git_stats:
-            if file_path not in git_cache:
-                git_cache[file_path] = build_git_input_for_llm(
-                    project_name, 
-                    file_path,
-                )
-            smell["git_analysis"] = git_cache[file_path]
+            smell.git_analysis = git_cache[file_path]
 
         if pylint:
-            if normalized_path not in pylint_cache:
-                pylint_cache[normalized_path] = build_llm_analysis_report(
-                    normalized_path
-                )["text"]
-            smell["pylint_report"] = pylint_cache[normalized_path]
+            smell.pylint_report = pylint_cache[normalized_path]
 
         if code_segment:
             key = (normalized_path, str(line_number))
             if key not in code_cache:
+                # Several smells usually point into the same file; read it from disk once.
+                if normalized_path not in source_cache:
+                    source_cache[normalized_path] = read_source(normalized_path)
                 code_cache[key] = get_code_segment_from_file_based_on_line_number(
                     start_line=line_number,
-                    file_path=normalized_path,
+                    code=source_cache[normalized_path],
                 ) or ""
-            smell["code_segment"] = code_cache[key]
+            smell.code_segment = code_cache[key]
 
         if test_coverage:
             file_coverage_report = return_test_coverage_analysis_for_file(project_name, file_path)
-            smell["test_coverage_report"] = file_coverage_report
+            smell.test_coverage_report = file_coverage_report
 
     return code_smells
 
@@ -98,21 +121,20 @@ def write_docs_to_file() -> None:
 
     def _normalize_line_number(value: Any) -> Any:
         """Convert NaN/None/float line numbers into JSON-friendly values."""
-        try:
-            if pd.isna(value):
+        if value is None:
+            return None
+        if isinstance(value, float):
+            if math.isnan(value):
                 return None
-        except TypeError:
-            pass
-
-        if isinstance(value, float) and value.is_integer():
-            return int(value)
+            if value.is_integer():
+                return int(value)
         return value
 
     sanitized_docs: List[dict[str, Any]] = []
     for smell in docs:
-        sanitized = dict(smell)
-        sanitized["line_number"] = _normalize_line_number(smell.get("line_number"))
-        code_value = smell.get("code_segment")
+        sanitized = smell.to_dict()
+        sanitized["line_number"] = _normalize_line_number(smell.line_number)
+        code_value = smell.code_segment
         if isinstance(code_value, str) and code_value.strip():
             # Wrap code in a small schema to signal its nature.
             sanitized["code_segment"] = {
@@ -123,8 +145,9 @@ def write_docs_to_file() -> None:
 
     payload = {"smells": sanitized_docs}
 
-    with open("docs.json", "w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2, ensure_ascii=True)
+    Path("docs.json").write_bytes(
+        orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    )
 
 
 def write_docs_to_text_file() -> None:
@@ -138,13 +161,13 @@ def write_docs_to_text_file() -> None:
     docs = add_further_context(simapy, docs, False, False, True)
 
     def _fmt_line(value: Any) -> str:
-        try:
-            if pd.isna(value):
+        if value is None:
+            return "N/A"
+        if isinstance(value, float):
+            if math.isnan(value):
                 return "N/A"
-        except TypeError:
-            pass
-        if isinstance(value, float) and value.is_integer():
-            return str(int(value))
+            if value.is_integer():
+                return str(int(value))
         return str(value)
 
     sections: List[str] = []
@@ -152,13 +175,13 @@ def write_docs_to_text_file() -> None:
 
         section = "\n".join(
             [
-                f"SMELL #{smell.get('index')}: {smell.get('name')}",
-                f"Type         : {smell.get('type_of_smell')}",
-                f"File         : {smell.get('file_path')}",
-                f"Module/Class : {smell.get('module_or_class')}",
-                f"Line         : {_fmt_line(smell.get('line_number'))}",
+                f"SMELL #{smell.index}: {smell.name}",
+                f"Type         : {smell.type_of_smell}",
+                f"File         : {smell.file_path}",
+                f"Module/Class : {smell.module_or_class}",
+                f"Line         : {_fmt_line(smell.line_number)}",
                 "Description:",
-                str(smell.get('description', '')).strip(),
+                str(smell.description or '').strip(),
                 "-" * 60,
             ]
         )
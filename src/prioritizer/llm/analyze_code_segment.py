@@ -1,8 +1,54 @@
-from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 
-_SUMMARY_CACHE: dict[Tuple[str, str, str, str], str] = {}
+from prioritizer.ingestion.smell import Smell
+from prioritizer.llm.ollama_client import OllamaGenerator
+
+CacheKey = Tuple[str, str, str, str]
+
+
+class _SummaryCache:
+    """
+    Thread-safe, size-bounded LRU mapping of cache keys to code-segment summaries.
+
+    Empty strings are stored for segments the LLM could not summarize, so a
+    `get` returning None always means a cache miss.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: OrderedDict[CacheKey, str] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: CacheKey, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+_SUMMARY_CACHE = _SummaryCache(maxsize=4096)
 
 SUMMARY_SYSTEM_PROMPT = """\
 You are a senior Python engineer specialized in code smells and technical debt.
@@ -15,13 +61,41 @@ Task:
 Return ONLY the summary text.
 """
 
-def _cache_key(smell: Dict[str, Any]) -> Tuple[str, str, str, str]:
-    snippet = smell.get("code_segment") or ""
+BATCH_SUMMARY_SYSTEM_PROMPT = SUMMARY_SYSTEM_PROMPT + """
+You will receive several smells at once. Each one starts with a line of the form
+`### SMELL <id>`. Write one summary per smell and start each summary with a line
+`### SUMMARY <id>` carrying the same id. Output nothing besides these blocks.
+"""
+
+_USER_TEMPLATE = """\
+Smell type: {name}
+Smell category: {category}
+
+Analyzer description:
+{desc}
+
+Code snippet:
+{code}
+"""
+
+_BATCH_ITEM_TEMPLATE = "### SMELL {id}\n" + _USER_TEMPLATE
+
+_SUMMARY_MARKER_RE = re.compile(r"^[ \t]*#{2,}[ \t]*SUMMARY[ \t]+(\S+)[ \t]*$", re.MULTILINE)
+
+def _cache_key(smell: Smell) -> CacheKey:
+    """
+    Build the summary cache key for a smell.
+
+    The snippet is identified by a BLAKE2b digest rather than the built-in `hash`,
+    which is salted per process. The key is therefore stable across runs and can be
+    used as-is by a persistent store (e.g. shelve or diskcache).
+    """
+    snippet = smell.code_segment or ""
     return (
-        str(smell.get("type_of_smell", "")),
-        str(smell.get("file_path", "")),
-        str(smell.get("line_number", "")),
-        str(hash(snippet)),
+        str(smell.type_of_smell),
+        str(smell.file_path),
+        str(smell.line_number),
+        hashlib.blake2b(snippet.encode("utf-8"), digest_size=16).hexdigest(),
     )
 
 def extract_text_content(content: Any) -> str:
@@ -45,45 +119,130 @@ def extract_text_content(content: Any) -> str:
 
     return str(content).strip()
 
+def _render_user_prompt(smell: Smell, code_segment: str) -> str:
+    return _USER_TEMPLATE.format_map({
+        "name": smell.name,
+        "category": smell.type_of_smell,
+        "desc": smell.description,
+        "code": code_segment,
+    })
+
+def _render_batch_prompt(batch: List[Tuple[Smell, str]]) -> str:
+    return "\n".join(
+        _BATCH_ITEM_TEMPLATE.format_map({
+            "id": smell.index,
+            "name": smell.name,
+            "category": smell.type_of_smell,
+            "desc": smell.description,
+            "code": code_segment,
+        })
+        for smell, code_segment in batch
+    )
+
+def _split_batch_response(text: str) -> Dict[str, str]:
+    """
+    Split a batched summary response into {smell id: summary} using the
+    `### SUMMARY <id>` markers. Text before the first marker is ignored.
+    """
+    markers = list(_SUMMARY_MARKER_RE.finditer(text))
+    summaries: Dict[str, str] = {}
+    for i, m in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        summaries[m.group(1)] = text[m.end():end].strip()
+    return summaries
+
+def _generate_all(llm: Union[BaseChatModel, OllamaGenerator], system_prompt: str, user_prompts: List[str]) -> List[str]:
+    """
+    One response text per user prompt, in order.
+
+    An `OllamaGenerator` sends the prompts concurrently through `run_batch`; a chat
+    model through `llm.batch`.
+    """
+    if isinstance(llm, OllamaGenerator):
+        return [extract_text_content(r) for r in llm.run_batch(user_prompts, system=system_prompt)["responses"]]
+
+    system_msg = SystemMessage(content=system_prompt)
+    responses = llm.batch([[system_msg, HumanMessage(content=p)] for p in user_prompts])
+    return [extract_text_content(resp.content) for resp in responses]
+
 def analyze_code_segments_via_ai(
-    smells: List[Dict[str, Any]],
-    llm: BaseChatModel,
+    smells: List[Smell],
+    llm: Union[BaseChatModel, OllamaGenerator],
     enabled: bool = True,
-) -> List[Dict[str, Any]]:
+    batch_size: int = 1,
+) -> List[Smell]:
+    """
+    Attach a short LLM summary of each smell's code segment as `ai_code_segment_summary`.
+
+    With `batch_size > 1` the uncached segments are sent `batch_size` at a time in one
+    prompt, and the batches go out concurrently through `llm.batch`. Any smell the
+    model leaves out of its batched answer is retried on its own. With an
+    `OllamaGenerator` and `batch_size <= 1`, the single-segment prompts themselves
+    go out concurrently (up to its `num_parallel`).
+    """
     if not enabled:
         for s in smells:
-            s["ai_code_segment_summary"] = None
+            s.ai_code_segment_summary = None
         return smells
 
+    # Smells that still need a summary, grouped by cache key so identical
+    # segments are only sent once.
+    pending: Dict[CacheKey, List[Tuple[Smell, str]]] = {}
+
     for smell in smells:
-        code_segment = (smell.get("code_segment") or "").strip()
+        code_segment = (smell.code_segment or "").strip()
         if not code_segment:
-            smell["ai_code_segment_summary"] = None
+            smell.ai_code_segment_summary = None
             continue
 
         key = _cache_key(smell)
-        if key in _SUMMARY_CACHE:
-            smell["ai_code_segment_summary"] = _SUMMARY_CACHE[key] or None
+        cached = _SUMMARY_CACHE.get(key)
+        if cached is not None:
+            smell.ai_code_segment_summary = cached or None
             continue
 
-        user_prompt = f"""\
-Smell type: {smell.get("name")}
-Smell category: {smell.get("type_of_smell")}
-
-Analyzer description:
-{smell.get("description")}
+        pending.setdefault(key, []).append((smell, code_segment))
 
-Code snippet:
-{code_segment}
-"""
+    def summarize_one(smell: Smell, code_segment: str) -> str:
+        user_prompt = _render_user_prompt(smell, code_segment)
+        if isinstance(llm, OllamaGenerator):
+            return _generate_all(llm, SUMMARY_SYSTEM_PROMPT, [user_prompt])[0]
 
         resp = llm.invoke([
             SystemMessage(content=SUMMARY_SYSTEM_PROMPT),
             HumanMessage(content=user_prompt),
         ])
-
-        summary = extract_text_content(resp.content)
-        smell["ai_code_segment_summary"] = summary if summary else None
-        _SUMMARY_CACHE[key] = smell["ai_code_segment_summary"] or ""
-
-    return smells
\ No newline at end of file
+        return extract_text_content(resp.content)
+
+    summaries: Dict[CacheKey, str] = {}
+    keys = list(pending)
+
+    if batch_size <= 1 and isinstance(llm, OllamaGenerator):
+        texts = _generate_all(llm, SUMMARY_SYSTEM_PROMPT, [_render_user_prompt(*pending[k][0]) for k in keys])
+        summaries.update(zip(keys, texts))
+    elif batch_size <= 1:
+        for key in keys:
+            summaries[key] = summarize_one(*pending[key][0])
+    elif pending:
+        batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+
+        responses = _generate_all(
+            llm,
+            BATCH_SUMMARY_SYSTEM_PROMPT,
+            [_render_batch_prompt([pending[k][0] for k in batch]) for batch in batches],
+        )
+
+        for batch, text in zip(batches, responses):
+            by_id = _split_batch_response(text)
+            for key in batch:
+                smell, code_segment = pending[key][0]
+                summary = by_id.get(str(smell.index))
+                summaries[key] = summary if summary else summarize_one(smell, code_segment)
+
+    for key, group in pending.items():
+        summary = summaries[key] or None
+        for smell, _ in group:
+            smell.ai_code_segment_summary = summary
+        _SUMMARY_CACHE.put(key, summary or "")
+
+    return smells
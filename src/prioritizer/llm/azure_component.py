@@ -1,11 +1,12 @@
 import os
 import json
-import csv
 import requests
 from typing import Optional, Dict, Any
 
 from haystack import component
 
+from prioritizer.llm.prompt_dump import dump_prompt_in_background
+
 
 @component
 class AzureOpenAIGenerator:
@@ -144,8 +145,7 @@ class AzureOpenAIGenerator:
     )
     def run(self, prompt: str) -> Dict[str, Any]:
         if self.full_prompt_file:
-            with open(self.full_prompt_file, "w", newline="", encoding="utf-8") as f:
-                csv.writer(f).writerow([prompt])
+            dump_prompt_in_background(self.full_prompt_file, prompt)
 
         body = self._build_body(prompt)
 
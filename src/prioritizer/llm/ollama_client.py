@@ -1,21 +1,42 @@
 from haystack import component
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
 import requests
-import csv
+
+from prioritizer.llm.prompt_dump import dump_prompt_in_background
+
+_PROMPT_SEPARATOR = "\n\n" + "=" * 80 + "\n\n"
 
 @component
 class OllamaGenerator:
-    def __init__(self, model="gpt-oss:120b-cloud", url="http://localhost:11434/api/generate", full_prompt_file: str = None):
+    def __init__(self, model="gpt-oss:120b-cloud", url="http://localhost:11434/api/generate", full_prompt_file: str = None, num_parallel: int = None):
         self.model = model
         self.url = url
         self.full_prompt_file = full_prompt_file
+        # Matches the server's OLLAMA_NUM_PARALLEL; more in-flight requests than that just queue up.
+        self.num_parallel = num_parallel or int(os.environ.get("OLLAMA_NUM_PARALLEL", 4))
 
-    def run(self, prompt: str):
-        if self.full_prompt_file is not None:
-            with open(self.full_prompt_file, "w", newline="", encoding="utf-8") as f: 
-                writer = csv.writer(f)
-                writer.writerow([prompt])
+        # requests.Session is not documented as thread-safe, so every thread that
+        # generates (the caller's and run_batch's workers) gets its own keep-alive session.
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
 
-        response = requests.post(self.url, json={
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def _generate(self, prompt: str, system: Optional[str] = None) -> str:
+        payload = {
             "model": self.model,
             "prompt": prompt,
             "stream": False,
@@ -24,8 +45,55 @@ class OllamaGenerator:
                 "seed": 42,
                 "top_p": 0,
             }
-        })
+        }
+        if system is not None:
+            payload["system"] = system
+
+        response = self._session().post(self.url, json=payload)
 
         result = response.json()
 
-        return {"response": result["response"]}
\ No newline at end of file
+        return result["response"]
+
+    def run(self, prompt: str):
+        if self.full_prompt_file is not None:
+            dump_prompt_in_background(self.full_prompt_file, prompt)
+
+        return {"response": self._generate(prompt)}
+
+    def run_batch(self, prompts: List[str], system: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Generate a response for every prompt, keeping up to `num_parallel` requests
+        in flight on worker threads. Responses are returned in prompt order.
+
+        Blocking and loop-agnostic, so it is safe to call from code that already runs
+        inside an event loop. When `full_prompt_file` is set, the whole batch is dumped
+        with a single write rather than one write per prompt.
+        """
+        if self.full_prompt_file is not None:
+            dump_prompt_in_background(self.full_prompt_file, _PROMPT_SEPARATOR.join(prompts))
+
+        if len(prompts) <= 1:
+            return {"responses": [self._generate(p, system) for p in prompts]}
+
+        # One pool for the generator's lifetime, so its threads (and their sessions)
+        # are reused across batches.
+        with self._sessions_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=max(self.num_parallel, 1), thread_name_prefix="ollama")
+            pool = self._pool
+
+        return {"responses": list(pool.map(lambda p: self._generate(p, system), prompts))}
+
+    def close(self) -> None:
+        with self._sessions_lock:
+            pool, self._pool = self._pool, None
+            sessions, self._sessions = self._sessions, []
+        if pool is not None:
+            pool.shutdown(wait=False)
+        for session in sessions:
+            session.close()
+
+    def __del__(self):
+        if getattr(self, "_sessions_lock", None) is not None:
+            self.close()
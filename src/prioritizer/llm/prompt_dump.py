@@ -0,0 +1,54 @@
+import atexit
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+_DUMP_QUEUE: "queue.Queue[Tuple[Path, str]]" = queue.Queue()
+_WRITER: Optional[threading.Thread] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def _write_prompt(path: Path, prompt: str) -> None:
+    # Written next to the target and renamed over it, so a reader never sees a
+    # half-written prompt.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(prompt, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _writer_loop() -> None:
+    while True:
+        path, prompt = _DUMP_QUEUE.get()
+        try:
+            _write_prompt(path, prompt)
+        except OSError as e:
+            print(f"Could not write prompt dump {path}: {e}")
+        finally:
+            _DUMP_QUEUE.task_done()
+
+
+def dump_prompt_in_background(path: str | Path, prompt: str) -> None:
+    """
+    Queue the full prompt to be written to `path` by a background writer thread.
+
+    The dump is only kept for inspection, so it should not hold up the LLM request.
+    A single writer handles the dumps in call order, so when the same path is dumped
+    twice in a row (the prompt, then the repair prompt) the later one is what ends
+    up on disk. Pending dumps are flushed before the interpreter exits.
+    """
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None or not _WRITER.is_alive():
+            _WRITER = threading.Thread(target=_writer_loop, name="prompt-dump", daemon=True)
+            _WRITER.start()
+    _DUMP_QUEUE.put((Path(path), prompt))
+
+
+def flush_prompt_dumps() -> None:
+    """Block until every queued prompt dump has been written."""
+    _DUMP_QUEUE.join()
+
+
+atexit.register(flush_prompt_dumps)
@@ -1,3 +1,7 @@
+from typing import Any, Sequence
+
+from jinja2 import BaseLoader, Environment
+
 PROMPT_TEMPLATE ="""\
 # PERSONA
 You are a senior software-quality analyst and technical-debt prioritization specialist.
@@ -181,4 +185,19 @@ No external literature was retrieved. Base your reasoning solely on the provided
 {{ question }}
 
 Now produce the final ranked prioritization list.
-"""
\ No newline at end of file
+"""
+
+
+# Default whitespace handling, as in Haystack's PromptBuilder, so the rendered prompt
+# is byte-for-byte the one the pipeline used to send.
+_ENV = Environment(loader=BaseLoader(), autoescape=False)
+COMPILED_PROMPT_TEMPLATE = _ENV.from_string(PROMPT_TEMPLATE)
+
+
+def render_prompt(smells: Sequence[Any], documents: Sequence[Any], question: str) -> str:
+    """
+    Render PROMPT_TEMPLATE with the given smell documents, retrieved literature and question.
+
+    The template is parsed and compiled once at import, so each call only pays for rendering.
+    """
+    return COMPILED_PROMPT_TEMPLATE.render(smells=smells, documents=documents, question=question)
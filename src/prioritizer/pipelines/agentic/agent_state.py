@@ -1,12 +1,14 @@
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, List, Dict, Any, Optional, Tuple, FrozenSet
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_chroma import Chroma
 
+from prioritizer.ingestion.smell import Smell
+
 from pathlib import Path
 
 class State(TypedDict):
     smell_types: List[str]                      
-    smells: Optional[List[Dict[str, Any]]]
+    smells: Optional[List[Smell]]
 
     repo: str
 
@@ -15,6 +17,7 @@ class State(TypedDict):
     code_context: str
     use_rag: bool
     use_test_coverage: bool
+    summary_batch_size: int
 
     llm: BaseChatModel
     store: Chroma
@@ -26,6 +29,10 @@ class State(TypedDict):
     completion_tokens: Optional[int]
     total_tokens: Optional[int]
 
+    expected_ids: Optional[Tuple[str, ...]]
+    expected_id_set: Optional[FrozenSet[str]]
+
+    reviewed_output_text: Optional[str]
     validation_errors: Optional[dict[str, Any]]
     is_valid: Optional[bool]
     repair_attempts: int
@@ -1,6 +1,7 @@
 from prioritizer.llm.analyze_code_segment import analyze_code_segments_via_ai
 from prioritizer.ingestion.smells_ingestion import read_and_store_relevant_smells, add_further_context
 from prioritizer.ingestion.chunking import convert_chunked_text_to_langchain_documents
+from prioritizer.ingestion.smell import Smell
 
 from prioritizer.pipelines.agentic.agent_state import State
 from prioritizer.pipelines.agentic.system_prompt import SYSTEM_PROMPT, SYSTEM_PROMPT2
@@ -10,8 +11,10 @@ from prioritizer.pipelines.agentic.embedding_retrieval import index_documents_in
 from prioritizer.pipelines.agentic.llm_model_factory import build_llm
 from prioritizer.llm.analyze_code_segment import extract_text_content
 
+from dataclasses import replace
 from pathlib import Path
-import csv
+import asyncio
+import io
 import argparse
 import os
 from typing import TypedDict, List, Dict, Any, Optional
@@ -22,17 +25,14 @@ from langchain_openai import AzureChatOpenAI
 from langchain_ollama import ChatOllama
 from langchain_core.messages import SystemMessage, HumanMessage
 
-def load_smells(state: State) -> State:
+def load_smells(state: State) -> Dict[str, Any]:
     smells_to_search_for = state.get("smell_types")
 
     smells = read_and_store_relevant_smells(smells_to_search_for)
 
-    return {
-        **state,
-        "smells": smells
-    }
+    return {"smells": smells}
 
-def create_more_context(state: State) -> State:
+def create_more_context(state: State) -> Dict[str, Any]:
     smells = state.get("smells") or []
 
     git_stats = state.get("use_git")
@@ -42,31 +42,25 @@ def create_more_context(state: State) -> State:
 
     smells = add_further_context(repo, smells, git_stats, pylint, True, test_coverage)
 
-    return {
-        **state,
-        "smells": smells
-    }
+    return {"smells": smells}
 
-def analyze_code_segments_with_agent(state: State) -> State:
+def analyze_code_segments_with_agent(state: State) -> Dict[str, Any]:
     smells = state.get("smells") or []
     use_analysis = state.get("code_context") == "analysis"
 
-    smells = analyze_code_segments_via_ai(smells, state.get("llm"), use_analysis)
-    prompt_tokens = state.get("prompt_tokens")
-
+    smells = analyze_code_segments_via_ai(
+        smells, state.get("llm"), use_analysis, state.get("summary_batch_size", 1)
+    )
 
-    return {
-        **state,
-        "smells": smells
-    }
+    return {"smells": smells}
 
-def _format_rag_results(s: Dict[str, Any], max_chars: int = 700) -> str:
+def _format_rag_results(s: Smell, max_chars: int = 700) -> str:
     """
     Formats RAG results as numbered document blocks with clear source attribution
     and snippet boundaries, making it easier for the LLM to reference and reason
     about individual pieces of evidence.
     """
-    ev = s.get("rag_results") or []
+    ev = s.rag_results or []
     if not ev:
         return "## BACKGROUND KNOWLEDGE\n<No documents retrieved>"
 
@@ -97,81 +91,81 @@ def _format_rag_results(s: Dict[str, Any], max_chars: int = 700) -> str:
 
     return "\n".join(blocks)
 
-def _format_smell_for_prompt(s: Dict[str, Any], idx: int, state: State) -> str:
+def _format_smell_for_prompt(s: Smell, idx: int, state: State) -> str:
     code_block = ""
 
-    if state.get("code_context") == "code": code_block = f"""\
-    Code segment:
-    {s.get("code_segment")}\n
-    """.strip()
-        
-    git_report = s.get("git_analysis") if s.get("git_analysis") != None else "<Unknown>"
-    pylint_report = s.get("pylint_report") if s.get("pylint_report") != None else "<Unknown>"
-    test_coverage_report = s.get("test_coverage_report") if s.get("test_coverage_report") != None else "<Unknown>"
-    ai_summary = s.get("ai_code_segment_summary") if s.get("ai_code_segment_summary") != None else "<Unknown>"
-
-
-    return f"""\
-# SMELL REPORT [NR. {idx}]
-id={s.get("index")}, smell={s.get("name")}, category={s.get("type_of_smell")},
-file={s.get("file_path")}, line={s.get("line_number")}
-
-## GENERAL DESCRIPTION:
-{s.get("description") if state.get("use_pylint") else "<No description provided.>"}
-
-## GIT ANALYSIS:
-{git_report}
+    if state.get("code_context") == "code":
+        code_block = f"Code segment:\n{s.code_segment}".strip()
 
-## PYLINT REPORT
-{pylint_report}
+    git_report = s.git_analysis if s.git_analysis is not None else "<Unknown>"
+    pylint_report = s.pylint_report if s.pylint_report is not None else "<Unknown>"
+    test_coverage_report = s.test_coverage_report if s.test_coverage_report is not None else "<Unknown>"
+    ai_summary = s.ai_code_segment_summary if s.ai_code_segment_summary is not None else "<Unknown>"
+    description = s.description if state.get("use_pylint") else "<No description provided.>"
 
-## TEST COVERAGE
-{test_coverage_report}
-
-{code_block}
-
-## AI SUMMARIZATION OF FILE
-{ai_summary}
+    parts = [
+        f"# SMELL REPORT [NR. {idx}]",
+        f"id={s.index}, smell={s.name}, category={s.type_of_smell},",
+        f"file={s.file_path}, line={s.line_number}",
+        "",
+        "## GENERAL DESCRIPTION:",
+        str(description),
+        "",
+        "## GIT ANALYSIS:",
+        git_report,
+        "",
+        "## PYLINT REPORT",
+        pylint_report,
+        "",
+        "## TEST COVERAGE",
+        test_coverage_report,
+        "",
+        code_block,
+        "",
+        "## AI SUMMARIZATION OF FILE",
+        ai_summary,
+        "",
+        "## RETRIEVED INFORMATION FROM RAG",
+        _format_rag_results(s),
+    ]
 
-## RETRIEVED INFORMATION FROM RAG
-{_format_rag_results(s)}
-""".strip()
+    return "\n".join(parts).strip()
 
 
-def build_article_query(smell: Dict[str, Any], include_code: str) -> str:
+def build_article_query(smell: Smell, include_code: str) -> str:
     parts = [
-        f"code smell: {smell.get('name','')}",
-        f"category: {smell.get('type_of_smell','')}",
-        f"file: {smell.get('file_path','')} line: {smell.get('line_number','')}",
-        smell.get("description", ""),
-        smell.get("ai_code_segment_summary", ""),
+        f"code smell: {smell.name}",
+        f"category: {smell.type_of_smell}",
+        f"file: {smell.file_path} line: {smell.line_number}",
+        smell.description,
+        smell.ai_code_segment_summary,
     ]
 
-    if smell.get("git_analysis"):
-        parts.append(smell["git_analysis"])
-    if smell.get("pylint_report"):
-        parts.append(smell["pylint_report"])
-    if include_code == "code" and smell.get("code_segment"):
-        parts.append(smell["code_segment"])
+    if smell.git_analysis:
+        parts.append(smell.git_analysis)
+    if smell.pylint_report:
+        parts.append(smell.pylint_report)
+    if include_code == "code" and smell.code_segment:
+        parts.append(smell.code_segment)
 
     return "\n".join([p.strip() for p in parts if p and str(p).strip()])
 
 
-def retrieve_processed_data_from_articles(state: State) -> State:
+def retrieve_processed_data_from_articles(state: State) -> Dict[str, Any]:
     store = state.get("store")
     smells = state.get("smells") or []
     top_k = 4
     include_code = state.get("code_context")
 
     if store is None or not smells:
-        return { **state }
+        return {}
 
-    new_smells: List[Dict[str, Any]] = []
+    new_smells: List[Smell] = []
     for s in smells:
         query = build_article_query(s, include_code=include_code)
 
         if not query.strip():
-            new_smells.append({**s, "rag_results": []})
+            new_smells.append(replace(s, rag_results=[]))
             continue
 
         retrieved_results = store.similarity_search_with_score(query, k=top_k)
@@ -184,21 +178,24 @@ def retrieve_processed_data_from_articles(state: State) -> State:
                 "score": float(score),
             })
 
-        new_smells.append({**s, "rag_results": evidence, "rag_query": query})
+        new_smells.append(replace(s, rag_results=evidence, rag_query=query))
 
-    return {**state, "smells": new_smells}
+    return {"smells": new_smells}
 
 
-def prioritize_smells_node(state: State) -> State:
+def prioritize_smells_node(state: State) -> Dict[str, Any]:
     smells = state.get("smells") or []
     llm = state.get("llm")
 
     if not smells:
-        return {**state, "output_text": "No smells to prioritize."}
+        return {"output_text": "No smells to prioritize."}
 
-    smells_block = "\n\n---\n\n".join(
-        _format_smell_for_prompt(s, idx=i+1, state=state) for i, s in enumerate(smells)
-    )
+    buf = io.StringIO()
+    for i, s in enumerate(smells):
+        if i:
+            buf.write("\n\n---\n\n")
+        buf.write(_format_smell_for_prompt(s, idx=i+1, state=state))
+    smells_block = buf.getvalue()
 
     out_dir = state.get("out_dir")
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -222,10 +219,7 @@ Smell instances:
 
     text = extract_text_content(resp.content)
 
-    return {
-        **state, 
-        "output_text": text if text else None
-    }
+    return {"output_text": text if text else None}
 
 def route_execution_after_review(state: State) -> str: 
     if state.get("is_valid"):
@@ -243,15 +237,15 @@ def route_execution_to_rag_node(state: State) -> str:
         return "prioritize_smells_node"
     
 
-def write_prioritization_report(state: State) -> State:
+def write_prioritization_report(state: State) -> Dict[str, Any]:
     out_dir = state.get("out_dir")
     out_dir.mkdir(parents=True, exist_ok=True)
     llm_output_file = out_dir / "output.csv"
 
-    with open(llm_output_file, "w", encoding="utf-8") as f:
-        csv.writer(f).writerow([state.get("output_text")])
+    # Written verbatim: the evaluation parser reads the table straight from this file.
+    llm_output_file.write_text(state.get("output_text") or "", encoding="utf-8")
 
-    return state
+    return {}
 
 
 def draw_graph(dir: Path, graph: Any) -> None:
@@ -329,7 +323,8 @@ def run_agent_pipeline(args: argparse.Namespace, smells: List, project_path: str
 
     compiled_graph = smells_graph.compile()
 
-    compiled_graph.invoke({
+    # repair_output_node is async, so the graph has to be driven by ainvoke.
+    asyncio.run(compiled_graph.ainvoke({
         "smell_types": smells,
         "smells": None,
         "use_git": args.include_git_stats,
@@ -337,6 +332,7 @@ def run_agent_pipeline(args: argparse.Namespace, smells: List, project_path: str
         "code_context": args.code_context_mode,
         "use_rag": args.use_rag,
         "use_test_coverage": args.use_test_coverage,
+        "summary_batch_size": args.summary_batch_size,
         "repo": project_path,
         "llm": llm,
         "store": store,
@@ -345,7 +341,7 @@ def run_agent_pipeline(args: argparse.Namespace, smells: List, project_path: str
         "prompt_tokens": 0,
         "completion_tokens": 0,
         "total_tokens": 0,
-    })
+    }))
 
     draw_graph(experiments_dir, compiled_graph)
 
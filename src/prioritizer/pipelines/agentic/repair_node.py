@@ -1,6 +1,9 @@
+from typing import Any, Dict
+
 from langchain_core.messages import SystemMessage, HumanMessage
 
 from prioritizer.pipelines.agentic.agent_state import State
+from prioritizer.pipelines.agentic.reviewing_output import get_expected_ids
 
 REPAIR_SYSTEM = """\
 You are a strict output repair assistant.
@@ -14,16 +17,15 @@ Return ONLY a corrected pipe-separated table.
 EXPECTED_HEADER = "Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization"
 
 
-def repair_output_node(state: State) -> State:
+async def repair_output_node(state: State) -> Dict[str, Any]:
     attempts = state.get("repair_attempts", 0)
     max_attempts = state.get("max_repair_attempts", 2)
 
     # If already exceeded, do nothing (review routing will stop)
     if attempts >= max_attempts:
-        return state
+        return {}
 
-    smells = state.get("smells") or []
-    expected_ids = [str(s.get("index")) for s in smells]
+    expected_ids, _ = get_expected_ids(state)
 
     errors = state.get("validation_errors") or {}
     prior = state.get("output_text") or ""
@@ -37,7 +39,7 @@ Required header (must be first row, exact):
 {EXPECTED_HEADER}
 
 Expected smell Ids (each exactly once):
-{expected_ids}
+{list(expected_ids)}
 
 Validation errors (fix ALL):
 {errors}
@@ -46,14 +48,13 @@ Prior output to repair:
 {prior}
 """
 
-    resp = llm.invoke([
+    resp = await llm.ainvoke([
         SystemMessage(content=REPAIR_SYSTEM),
         HumanMessage(content=user_msg),
     ])
 
     fixed = (resp.content or "").strip()
     return {
-        **state,
         "output_text": fixed,
         "repair_attempts": attempts + 1,
     }
@@ -1,80 +1,198 @@
 from prioritizer.pipelines.agentic.agent_state import State
 
 import re
-from typing import Tuple, List
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple
 
 EXPECTED_HEADER = "Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization"
 SEVERITY_ORDER = {"HIGH": 2, "MEDIUM": 1, "LOW": 0}
 
-def normalize_llm_output(text: str) -> str:
-    if not text:
-        return text
+_INVALID_HEADER_MSG = f"The table header is incorrect. The first row MUST be exactly: '{EXPECTED_HEADER}'. Do not add, remove, or rename columns."
 
-    text = text.strip()
+FENCE_TOKENS = ('```csv', '```text', '```', '"', "'")
+_FENCE_EDGE_CHARS = frozenset('`"\'')
+_FENCE_LINES = frozenset(('```', '```text', '```csv'))
+_SEP_RE = re.compile(r"[-|:\s]+")
 
-    for token in ('```csv', '```text', '```', '"', "'"):
-        if text.startswith(token): text = text[len(token):].strip()
-        if text.endswith(token): text = text[:-len(token)].strip()
 
-    text = re.sub(r'^[^0-9A-Za-z]+', '', text)
-    text = re.sub(r'[^0-9A-Za-z]+$', '', text)
+def _is_ascii_alnum(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
 
-    return text
 
+def normalize_llm_output(text: str) -> str:
+    """
+    Strip code fences, wrapping quotes and any leading/trailing non-alphanumeric
+    characters from an LLM response, leaving the table body.
+    """
+    if not text:
+        return text
+
+    text = text.strip()
 
-def _parse_table(text: str) -> Tuple[List[str], List[List[str]]]:
+    # Peel fences/quotes off both ends; only look at the tokens when the edge
+    # character can actually start one.
+    changed = True
+    while changed and text:
+        changed = False
+        if text[0] in _FENCE_EDGE_CHARS:
+            for token in FENCE_TOKENS:
+                if text.startswith(token):
+                    text = text[len(token):].strip()
+                    changed = True
+                    break
+        if text and text[-1] in _FENCE_EDGE_CHARS:
+            for token in FENCE_TOKENS:
+                if text.endswith(token):
+                    text = text[:-len(token)].strip()
+                    changed = True
+                    break
+
+    left, right = 0, len(text)
+    while left < right and not _is_ascii_alnum(text[left]):
+        left += 1
+    while right > left and not _is_ascii_alnum(text[right - 1]):
+        right -= 1
+
+    return text[left:right]
+
+
+@lru_cache(maxsize=8)
+def _parse_table(text: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, ...], ...]]:
     """
     Returns (lines, rows) where rows are split by '|' and stripped.
     Ignores empty lines.
+
+    Results are cached per text, so a review round over output the repair step
+    left unchanged does not parse it again. Tuples keep the cached value immutable.
     """
     text = normalize_llm_output(text)
 
     lines = [ln.strip() for ln in (text or "").splitlines() if ln.strip()]
     if not lines:
-        return [], []
+        return (), ()
 
-    lines = [ln for ln in lines if ln not in ("```", "```text", "```csv")]
+    lines = [ln for ln in lines if ln not in _FENCE_LINES]
 
     rows = []
     for ln in lines:
         # Skip separator lines if it tries markdown tables
-        if re.fullmatch(r"[-|:\s]+", ln):
+        if _SEP_RE.fullmatch(ln):
             continue
-        parts = [p.strip() for p in ln.split("|")]
+        parts = tuple(p.strip() for p in ln.split("|"))
         rows.append(parts)
 
-    return lines, rows
+    return tuple(lines), tuple(rows)
+
+def get_expected_ids(state: State) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """
+    Return the smell ids the output must contain, as an ordered tuple and a set.
+
+    The smells do not change once prioritization starts, so the review node stores
+    both on the state and later review/repair rounds reuse them.
+    """
+    expected_ids = state.get("expected_ids")
+    expected_id_set = state.get("expected_id_set")
+    if expected_ids is None or expected_id_set is None:
+        expected_ids = tuple(str(s.index) for s in state.get("smells") or [])
+        expected_id_set = frozenset(expected_ids)
+    return expected_ids, expected_id_set
 
-def review_output_node(state: State) -> State:
-    smells = state.get("smells") or []
-    expected_ids = [str(s.get("index")) for s in smells]
-    expected_id_set = set(expected_ids)
+
+def review_output_node(state: State) -> Dict[str, Any]:
+    return review_output_batch([state])[0]
+
+
+def review_output_batch(states: List[State]) -> List[Dict[str, Any]]:
+    """
+    Review several LLM outputs in one call, returning one state update per input
+    state, in order.
+
+    States that share the same smells list (e.g. several samples for one run)
+    share a single expected-id tuple/set instead of rebuilding it per output.
+    """
+    updates: List[Dict[str, Any]] = []
+    ids_by_smells: Dict[int, Tuple[Tuple[str, ...], FrozenSet[str]]] = {}
+
+    for state in states:
+        output_text = state.get("output_text")
+
+        # A repair round that left the output untouched cannot change the verdict;
+        # validation_errors/is_valid on the state are still the ones for this text.
+        if (
+            state.get("validation_errors") is not None
+            and state.get("reviewed_output_text") == output_text
+        ):
+            updates.append({})
+            continue
+
+        smells_key = id(state.get("smells"))
+        if state.get("expected_ids") is None and smells_key in ids_by_smells:
+            expected_ids, expected_id_set = ids_by_smells[smells_key]
+        else:
+            expected_ids, expected_id_set = get_expected_ids(state)
+            ids_by_smells[smells_key] = (expected_ids, expected_id_set)
+
+        errors = _validate_output(output_text, expected_ids, expected_id_set)
+
+        updates.append({
+            "expected_ids": expected_ids,
+            "expected_id_set": expected_id_set,
+            "reviewed_output_text": output_text,
+            "validation_errors": errors,
+            "is_valid": len(errors) == 0,
+        })
+
+    return updates
+
+
+def _validate_output(
+    output_text: str | None,
+    expected_ids: Tuple[str, ...],
+    expected_id_set: FrozenSet[str],
+) -> Dict[str, str]:
     n = len(expected_ids)
 
-    text = (state.get("output_text") or "").strip()
+    text = (output_text or "").strip()
     errors: dict[str, str] = {}
 
     if not text:
         errors["Empty output"] = "Empty output_text."
-        return {**state, "validation_errors": errors, "is_valid": False}
+        return errors
+
+    # Fast reject for output that is not a table at all (prose, refusals): with
+    # no '|' anywhere no line can parse as a row, so the full parse and per-row
+    # checks have nothing to report. Anything with pipes, even a truncated or
+    # headerless table, goes through full validation so the repair prompt sees
+    # the row-level errors.
+    if "|" not in normalize_llm_output(text):
+        errors["Invalid header format"] = _INVALID_HEADER_MSG
+        errors["Incorrect number of rows"] = f"The output must contain exactly one data row per smell. Expected {n} rows (excluding the header), "\
+        "but the output does not contain a pipe-separated table."
+        return errors
 
     _, rows = _parse_table(text)
     if not rows:
         errors["Empty rows"] = "Could not parse any rows from output."
-        return {**state, "validation_errors": errors, "is_valid": False}
+        return errors
 
     header = "|".join(rows[0]).strip()
     if header != EXPECTED_HEADER:
-        errors["Invalid header format"] = f"The table header is incorrect. The first row MUST be exactly: '{EXPECTED_HEADER}'. Do not add, remove, or rename columns."
+        errors["Invalid header format"] = _INVALID_HEADER_MSG
 
 
     data_rows = rows[1:]
     if len(data_rows) != n:
         errors["Incorrect number of rows"] = f"The output must contain exactly one data row per smell. Expected {n} rows (excluding the header), but found {len(data_rows)}."
 
-    seen_ranks = []
-    seen_ids = []
-    severities_in_rank_order = []
+    # Running state for the cross-row checks, updated in the same pass as the
+    # per-row checks: ranks as a bitmap over 1..n, ids in a Counter, and the
+    # valid severities in row order.
+    seen_ranks: List[int] = []
+    rank_bitmap = 0
+    rank_out_of_range = False
+    id_counts: Counter[str] = Counter()
+    severities: List[str] = []
 
     for i, r in enumerate(data_rows, start=1):
         if len(r) != 7:
@@ -90,36 +208,40 @@ def review_output_node(state: State) -> State:
             errors["Invalid rank value"] = f"Row {i} has an invalid Rank value ('{rank_s}'). "\
             "Rank MUST be a positive integer starting at 1."
         else:
-            seen_ranks.append(int(rank_s))
+            rank = int(rank_s)
+            seen_ranks.append(rank)
+            if rank > n:
+                rank_out_of_range = True
+            else:
+                rank_bitmap |= 1 << rank
 
         if not id_s:
             errors["Non-numerical id"] = f"Row {i}: Missing Id."
         else:
-            seen_ids.append(id_s)
+            id_counts[id_s] += 1
 
         severity_u = (severity or "").strip().upper()
         if severity_u not in SEVERITY_ORDER:
             errors["Invalid severity value"] = f"Row {i} has an invalid Severity ('{severity}'). "\
             "Severity MUST be one of: HIGH, MEDIUM, LOW."
         else:
-            severities_in_rank_order.append(severity_u)
+            severities.append(severity_u)
 
         if not reason or len(reason) < 5:
             errors["Lacking description"] = f"Row {i}: Reason is too short or missing."
 
-    
     if seen_ranks:
-        if sorted(seen_ranks) != list(range(1, n + 1)):
+        # n distinct ranks filling every bit 1..n means exactly the ranks 1..n.
+        ranks_complete = rank_bitmap == (1 << (n + 1)) - 2
+        if rank_out_of_range or len(seen_ranks) != n or not ranks_complete:
             errors["Invalid rank ordering"] = f"Ranks must be sequential integers from 1 to {n} with no gaps or duplicates. "\
             f"Detected ranks: {sorted(seen_ranks)}."
 
-    if seen_ids:
-        seen_id_set = set(seen_ids)
+    if id_counts:
+        seen_id_set = id_counts.keys()
         missing = sorted(expected_id_set - seen_id_set)
         extra = sorted(seen_id_set - expected_id_set)
-
-        
-        dupes = sorted({x for x in seen_ids if seen_ids.count(x) > 1})
+        dupes = sorted(id_ for id_, count in id_counts.items() if count > 1)
         if missing:
             errors["Missing smell identifiers"] = f"The output does not include all required smell Ids. "\
             f"Missing Ids: {missing}. Each smell MUST appear exactly once."
@@ -132,16 +254,15 @@ def review_output_node(state: State) -> State:
             errors["Duplicate smell identifiers"] = f"The following smell Ids appear more than once: {dupes}. "\
             "Each smell Id MUST appear exactly once."
 
-    # Severity constraint: LOW cannot appear above any MEDIUM/HIGH
-    if severities_in_rank_order:
-        seen_low = False
-        for idx, sev in enumerate(severities_in_rank_order, start=1):
-            if sev == "LOW":
-                seen_low = True
-            elif seen_low and sev in ("MEDIUM", "HIGH"):
-                errors["Severity ordering violation"] = f"A {sev}-severity smell appears at rank {idx} after a LOW-severity smell. "\
-                "LOW severity smells MUST NOT be ranked above MEDIUM or HIGH severity smells."
-                break
-
-    is_valid = len(errors) == 0
-    return {**state, "validation_errors": errors, "is_valid": is_valid}
+    # Severity constraint: LOW cannot appear above any MEDIUM/HIGH, i.e. nothing
+    # after the first LOW may be anything but LOW.
+    first_low = severities.index("LOW") if "LOW" in severities else len(severities)
+    violation = next(
+        (pos for pos in range(first_low + 1, len(severities)) if severities[pos] != "LOW"),
+        None,
+    )
+    if violation is not None:
+        errors["Severity ordering violation"] = f"A {severities[violation]}-severity smell appears at rank {violation + 1} after a LOW-severity smell. "\
+        "LOW severity smells MUST NOT be ranked above MEDIUM or HIGH severity smells."
+
+    return errors
@@ -1,25 +1,44 @@
 from prioritizer.analysis import build_project_structure
 from prioritizer.ingestion.chunking import convert_chunked_text_to_haystack_documents
 from prioritizer.llm.analyze_code_segment import analyze_code_segments_via_ai
-from prioritizer.llm.prompt_template import PROMPT_TEMPLATE
+from prioritizer.llm.prompt_template import render_prompt
 from prioritizer.llm.ollama_client import OllamaGenerator
 from prioritizer.llm.azure_component import AzureOpenAIGenerator
 from prioritizer.ingestion.smells_ingestion import read_and_store_relevant_smells, add_further_context
+from prioritizer.ingestion.smell import Smell
 
 from haystack import Pipeline, Document
-from haystack.components.builders.prompt_builder import PromptBuilder
 from haystack_integrations.document_stores.chroma import ChromaDocumentStore
 from haystack.components.embedders import SentenceTransformersDocumentEmbedder, SentenceTransformersTextEmbedder
 from haystack_integrations.components.retrievers.chroma import ChromaEmbeddingRetriever
 
-from langchain_ollama import ChatOllama
+import numpy as np
 
-import csv
+import hashlib
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Any, Optional
 
 
-def build_haystack_documents(smells: dict[str, Any], code_context_mode: str = "analysis") -> List[Document]:
+_SMELL_DOCUMENT_FMT = (
+    "# SMELL\n"
+    "Id: {}\n"
+    "Yype of smell: {}\n"
+    "Name: {}\n"
+    "File path: {}\n"
+    "Module/class: {}\n"
+    "Line Number: {}\n"
+    "\n"
+    "## DESCRIPTION\n{}\n\n"
+    "## GIT_ANALYSIS\n{}\n\n"
+    "## PYLINT_REPORT\n{}\n\n"
+    "## TEST_COVERAGE\n{}\n\n"
+    "{}\n{}\n"
+).format
+
+
+def build_haystack_documents(smells: List[Smell], code_context_mode: str = "analysis") -> List[Document]:
     docs: List[Document] = []
     use_ai_analysis = code_context_mode == "analysis"
     include_raw_code = code_context_mode == "code"
@@ -28,49 +47,96 @@ def build_haystack_documents(smells: dict[str, Any], code_context_mode: str = "a
     for s in smells:
         code_context = None
         if use_ai_analysis:
-            code_context = s.get("ai_code_segment_summary")
+            code_context = s.ai_code_segment_summary
         if code_context is None and include_raw_code:
-            code_context = s.get("code_segment")
-
-        content = (
-            f"# SMELL\n"
-            f"Id: {s.get('index')}\n"
-            f"Yype of smell: {s.get('type_of_smell')}\n"
-            f"Name: {s.get('name')}\n"
-            f"File path: {s.get('file_path')}\n"
-            f"Module/class: {s.get('module_or_class')}\n"
-            f"Line Number: {s.get('line_number')}\n"
-            f"\n"
-            f"## DESCRIPTION\n{s.get('description') if s.get('pylint_report') else 'N/A'}\n\n"
-            f"## GIT_ANALYSIS\n{s.get('git_analysis', 'N/A')}\n\n"
-            f"## PYLINT_REPORT\n{s.get('pylint_report', 'N/A')}\n\n"
-            f"## TEST_COVERAGE\n{s.get('test_coverage_report', 'N/A')}\n\n"
-            f"{context_label}\n{code_context or 'N/A'}\n"
+            code_context = s.code_segment
+
+        content = _SMELL_DOCUMENT_FMT(
+            s.index,
+            s.type_of_smell,
+            s.name,
+            s.file_path,
+            s.module_or_class,
+            s.line_number,
+            s.description if s.pylint_report else "N/A",
+            s.git_analysis or "N/A",
+            s.pylint_report or "N/A",
+            s.test_coverage_report or "N/A",
+            context_label,
+            code_context or "N/A",
         )
 
         docs.append(Document(
             content=content,
             meta={
                 "type": "smell",
-                "index": s.get("index"),
-                "smell_name": s.get("name"),
-                "file_path": s.get("file_path"),
-                "description": s.get("description"),
+                "index": s.index,
+                "smell_name": s.name,
+                "file_path": s.file_path,
+                "description": s.description,
             }
         ))
     return docs
 
 
+@lru_cache(maxsize=4)
 def load_embedder_pair(
     model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    batch_size: int = 64,
 ) -> tuple[SentenceTransformersDocumentEmbedder, SentenceTransformersTextEmbedder]:
-    doc_embedder = SentenceTransformersDocumentEmbedder(model=model_name)
+    # Cached per (model, batch size): warming up loads the transformer weights, which
+    # only needs to happen once per process however many pipeline runs reuse it.
+    # No device is passed: Haystack already picks a GPU when one is available.
+    doc_embedder = SentenceTransformersDocumentEmbedder(model=model_name, batch_size=batch_size)
     query_embedder = SentenceTransformersTextEmbedder(model=model_name)
     doc_embedder.warm_up()
     query_embedder.warm_up()
     return doc_embedder, query_embedder
 
 
+EMBEDDING_CACHE_DIR = Path("src/prioritizer/data/embeddings_cache")
+
+
+def _embedding_cache_path(model_name: str, text: str, cache_dir: Path) -> Path:
+    # The model is part of the key: the same chunk embeds differently per model.
+    digest = hashlib.blake2b(f"{model_name}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+    return cache_dir / f"{digest}.npy"
+
+
+def embed_documents_with_cache(
+    doc_embedder: SentenceTransformersDocumentEmbedder,
+    documents: List[Document],
+    cache_dir: Path = EMBEDDING_CACHE_DIR,
+) -> List[Document]:
+    """
+    Embed documents, reusing vectors stored on disk from earlier runs.
+
+    Each vector is kept as `<blake2b(model, content)>.npy` under `cache_dir`, so chunks
+    that were embedded before (e.g. after the Chroma store was reset, or for another
+    project) skip the transformer. Only the cache misses are sent to the embedder.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = [_embedding_cache_path(doc_embedder.model, doc.content or "", cache_dir) for doc in documents]
+
+    result: List[Optional[Document]] = []
+    missing: List[int] = []
+    for i, (doc, path) in enumerate(zip(documents, paths)):
+        if path.exists():
+            result.append(replace(doc, embedding=np.load(path, mmap_mode="r").tolist()))
+        else:
+            result.append(None)
+            missing.append(i)
+
+    if missing:
+        embedded = doc_embedder.run(documents=[documents[i] for i in missing])["documents"]
+        for i, doc in zip(missing, embedded):
+            np.save(paths[i], np.asarray(doc.embedding, dtype=np.float32))
+            result[i] = doc
+
+    return result
+
+
 def ensure_articles_indexed(
     document_store: ChromaDocumentStore,
     doc_embedder: SentenceTransformersDocumentEmbedder,
@@ -86,18 +152,37 @@ def ensure_articles_indexed(
         return
 
     chunked_docs = convert_chunked_text_to_haystack_documents()
-    embedded_docs = doc_embedder.run(documents=chunked_docs)["documents"]
+    embedded_docs = embed_documents_with_cache(doc_embedder, chunked_docs)
     document_store.write_documents(embedded_docs)
     print(f"Embedded {len(embedded_docs)} article chunks and wrote them to Chroma.")
 
 
+def embed_query_with_cache(
+    query_embedder: SentenceTransformersTextEmbedder,
+    question: str,
+    cache_dir: Path = EMBEDDING_CACHE_DIR,
+) -> List[float]:
+    """
+    Embed the retrieval question, reusing the vector from an earlier run when the
+    same question was already embedded with the same model.
+    """
+    path = _embedding_cache_path(f"{query_embedder.model}:query", question, cache_dir)
+    if path.exists():
+        return np.load(path).tolist()
+
+    query_embedding = query_embedder.run(question)["embedding"]
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    np.save(path, np.asarray(query_embedding, dtype=np.float32))
+    return query_embedding
+
+
 def retrieve_documents(
     query_embedder: SentenceTransformersTextEmbedder,
     document_store: ChromaDocumentStore,
     question: str,
 ) -> List[Document]:
     """Embeds the question and retrieves relevant documents from the store."""
-    query_embedding = query_embedder.run(question)["embedding"]
+    query_embedding = embed_query_with_cache(query_embedder, question)
     retriever = ChromaEmbeddingRetriever(document_store=document_store)
     return retriever.run(query_embedding=query_embedding)["documents"]
 
@@ -108,17 +193,15 @@ def build_llm(provider: str, model_name: str, prompt_file: Path, deployment: str
     return AzureOpenAIGenerator(deployment, full_prompt_file=prompt_file)
 
 
-def build_pipeline(prompt_template: str, model_name: str, prompt_file: Path, provider: str, deployment_name: str) -> Pipeline:
-    prompt_builder = PromptBuilder(
-        template=prompt_template,
-        required_variables=["question", "smells"],
-    )
+def build_pipeline(model_name: str, prompt_file: Path, provider: str, deployment_name: str) -> Pipeline:
+    """
+    Build the generation pipeline. The prompt itself is rendered up front with
+    `render_prompt`, which reuses the template compiled at import time.
+    """
     llm = build_llm(provider, model_name, prompt_file, deployment_name)
 
     pipeline = Pipeline()
-    pipeline.add_component("prompt_builder", prompt_builder)
     pipeline.add_component("llm", llm)
-    pipeline.connect("prompt_builder.prompt", "llm.prompt")
 
     return pipeline
 
@@ -138,7 +221,7 @@ def prepare_smells(args, smells: List[str], project_path: str, llm) -> List[Docu
         use_code_segment,
         args.use_test_coverage,
     )
-    code_smells_dic = analyze_code_segments_via_ai(code_smells_dic, llm, use_ai_analysis)
+    code_smells_dic = analyze_code_segments_via_ai(code_smells_dic, llm, use_ai_analysis, args.summary_batch_size)
     return build_haystack_documents(code_smells_dic, args.code_context_mode)
 
 
@@ -157,13 +240,15 @@ def build_question() -> str:
     )
 
 
-def run_rag_pipeline(args, smells: List[str], document_store: ChromaDocumentStore, project_path: str, experiments_dir: Path, deployment_name: str) -> Path:
+def run_rag_pipeline(args, smells: List[str], document_store: Optional[ChromaDocumentStore], project_path: str, experiments_dir: Path, deployment_name: str) -> Path:
     
     experiments_dir.mkdir(parents=True, exist_ok=True)
     full_prompt_file = experiments_dir / "prompt.txt"
 
-    pipeline   = build_pipeline(PROMPT_TEMPLATE, args.ollama_model, full_prompt_file, args.llm_provider, deployment_name)
-    llm_client = ChatOllama(model=args.ollama_model, temperature=0, seed=42)
+    pipeline   = build_pipeline(args.ollama_model, full_prompt_file, args.llm_provider, deployment_name)
+    # Segment summaries go straight to Ollama: its run_batch keeps several summary
+    # requests in flight instead of sending them one after another.
+    llm_client = OllamaGenerator(model=args.ollama_model)
 
     documents = prepare_smells(args, smells, project_path, llm_client)
     if not documents:
@@ -173,23 +258,23 @@ def run_rag_pipeline(args, smells: List[str], document_store: ChromaDocumentStor
     question = build_question()
 
     retrieved_documents: List[Document] = []
-    if args.use_rag:
+    if args.use_rag and document_store is not None:
         doc_embedder, query_embedder = load_embedder_pair()
         ensure_articles_indexed(document_store, doc_embedder, args.use_rag, args.persistent_storage)
         retrieved_documents = retrieve_documents(query_embedder, document_store, question)
 
-    prompt_inputs = {
-        "question":          question,
-        "smells":            documents,
-        "documents":         retrieved_documents,
-    }
+    prompt = render_prompt(
+        smells=documents,
+        documents=retrieved_documents,
+        question=question,
+    )
 
     print("Running model:", args.ollama_model)
-    results = pipeline.run({"prompt_builder": prompt_inputs})["llm"]
+    results = pipeline.run({"llm": {"prompt": prompt}})["llm"]
 
+    # Written verbatim: the evaluation parser reads the table straight from this file.
     llm_output_file = experiments_dir / "output.csv"
-    with open(llm_output_file, "w", encoding="utf-8") as f:
-        csv.writer(f).writerow([results["response"]])
+    llm_output_file.write_text(results["response"], encoding="utf-8")
 
     if args.llm_provider == "azure":
         print(results["prompt_tokens"])
@@ -5,7 +5,17 @@ from langchain_core.messages import AIMessage
 class FakeLLM:
     response_text: str
     last_messages: list = None
+    batch_response_text: str = None
+    invoke_count: int = 0
 
     def invoke(self, messages):
         self.last_messages = messages
+        self.invoke_count += 1
         return AIMessage(content=self.response_text)
+
+    async def ainvoke(self, messages):
+        return self.invoke(messages)
+
+    def batch(self, inputs):
+        text = self.batch_response_text if self.batch_response_text is not None else self.response_text
+        return [AIMessage(content=text) for _ in inputs]
@@ -1,6 +1,8 @@
 from pathlib import Path
 from typing import List, Dict, Any
 
+from prioritizer.ingestion.smell import Smell
+
 
 CORRECT_OUTPUT = """\
 "Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization
@@ -47,80 +49,80 @@ Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization
 """
 
 MOCK_SMELLS = [
-    {
-        "index": "14",
-        "type_of_smell": "Feature Envy",
-        "name": "calculate_semantic_coupling",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/metrics/coupling.py",
-        "description": "Core metric method heavily relies on OS utilities, creating strong propagation risk across the codebase",
-    },
-    {
-        "index": "20",
-        "type_of_smell": "Feature Envy",
-        "name": "calculate_change_proneness",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/metrics/change_proneness.py",
-        "description": "Extremely long method with intensive diff API usage, high coupling and maintenance cost",
-    },
-    {
-        "index": "21",
-        "type_of_smell": "Feature Envy",
-        "name": "calculate_error_proneness",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/metrics/change_proneness.py",
-        "description": "Large method mixing bug-related logic, tightly coupled to external file-bug data, high defect risk",
-    },
-    {
-        "index": "13",
-        "type_of_smell": "Feature Envy",
-        "name": "calculate_structural_coupling",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/metrics/coupling.py",
-        "description": "Relies heavily on commit objects, propagating changes throughout core metric calculations",
-    },
-    {
-        "index": "19",
-        "type_of_smell": "Feature Envy",
-        "name": "calculate_change_frequency",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/metrics/change_proneness.py",
-        "description": "Long method with multiple responsibilities, core metric impact and high change risk",
-    },
-    {
-        "index": "15",
-        "type_of_smell": "Feature Envy",
-        "name": "calculate_cohesion",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/metrics/coupling.py",
-        "description": "Repeated OS calls within core metric, moderate propagation risk",
-    },
-    {
-        "index": "9",
-        "type_of_smell": "Feature Envy",
-        "name": "calculate_co_change_metrics",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/metrics/co_change.py",
-        "description": "Matrix-centric logic tightly bound to external structures, affecting core co-change analysis",
-    },
-    {
-        "index": "5",
-        "type_of_smell": "Feature Envy",
-        "name": "main",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/cli.py",
-        "description": "CLI entry point tightly coupled to argument namespace, broad application impact",
-    },
-    {
-        "index": "23",
-        "type_of_smell": "Feature Envy",
-        "name": "get_logger",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/utils/logger.py",
-        "description": "Logger factory depends on global logging module, affecting logging throughout the project",
-    },
-    {
-        "index": "22",
-        "type_of_smell": "Feature Envy",
-        "name": "setup_logging",
-        "file_path": "../test_projects/gitmetrics/gitmetrics/utils/logger.py",
-        "description": "Logging configuration manipulates root_logger directly, influencing global logger behavior",
-    },
+    Smell(
+        index=14,
+        type_of_smell="Feature Envy",
+        name="calculate_semantic_coupling",
+        file_path="../test_projects/gitmetrics/gitmetrics/metrics/coupling.py",
+        description="Core metric method heavily relies on OS utilities, creating strong propagation risk across the codebase",
+    ),
+    Smell(
+        index=20,
+        type_of_smell="Feature Envy",
+        name="calculate_change_proneness",
+        file_path="../test_projects/gitmetrics/gitmetrics/metrics/change_proneness.py",
+        description="Extremely long method with intensive diff API usage, high coupling and maintenance cost",
+    ),
+    Smell(
+        index=21,
+        type_of_smell="Feature Envy",
+        name="calculate_error_proneness",
+        file_path="../test_projects/gitmetrics/gitmetrics/metrics/change_proneness.py",
+        description="Large method mixing bug-related logic, tightly coupled to external file-bug data, high defect risk",
+    ),
+    Smell(
+        index=13,
+        type_of_smell="Feature Envy",
+        name="calculate_structural_coupling",
+        file_path="../test_projects/gitmetrics/gitmetrics/metrics/coupling.py",
+        description="Relies heavily on commit objects, propagating changes throughout core metric calculations",
+    ),
+    Smell(
+        index=19,
+        type_of_smell="Feature Envy",
+        name="calculate_change_frequency",
+        file_path="../test_projects/gitmetrics/gitmetrics/metrics/change_proneness.py",
+        description="Long method with multiple responsibilities, core metric impact and high change risk",
+    ),
+    Smell(
+        index=15,
+        type_of_smell="Feature Envy",
+        name="calculate_cohesion",
+        file_path="../test_projects/gitmetrics/gitmetrics/metrics/coupling.py",
+        description="Repeated OS calls within core metric, moderate propagation risk",
+    ),
+    Smell(
+        index=9,
+        type_of_smell="Feature Envy",
+        name="calculate_co_change_metrics",
+        file_path="../test_projects/gitmetrics/gitmetrics/metrics/co_change.py",
+        description="Matrix-centric logic tightly bound to external structures, affecting core co-change analysis",
+    ),
+    Smell(
+        index=5,
+        type_of_smell="Feature Envy",
+        name="main",
+        file_path="../test_projects/gitmetrics/gitmetrics/cli.py",
+        description="CLI entry point tightly coupled to argument namespace, broad application impact",
+    ),
+    Smell(
+        index=23,
+        type_of_smell="Feature Envy",
+        name="get_logger",
+        file_path="../test_projects/gitmetrics/gitmetrics/utils/logger.py",
+        description="Logger factory depends on global logging module, affecting logging throughout the project",
+    ),
+    Smell(
+        index=22,
+        type_of_smell="Feature Envy",
+        name="setup_logging",
+        file_path="../test_projects/gitmetrics/gitmetrics/utils/logger.py",
+        description="Logging configuration manipulates root_logger directly, influencing global logger behavior",
+    ),
 ]
 
 
-def make_mock_state(output_text: str, smells: List[Dict[str, Any]], max_repairs: int = 2) -> Dict[str, Any]:
+def make_mock_state(output_text: str, smells: List[Smell], max_repairs: int = 2) -> Dict[str, Any]:
     return {
         "smell_types": ["Long Method", "Large Class", "Long File", "High Cyclomatic Complexity", "Feature Envy"],
         "smells": smells,
@@ -0,0 +1,47 @@
+from prioritizer.analysis.analysis_cache import load_cached_result, store_cached_result
+
+
+def test_stored_result_round_trips(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text("x = 1\n", encoding="utf-8")
+
+    store_cached_result("tool:v1", str(module), {"loc": 1, "names": ["x"]}, cache_dir=tmp_path / "cache")
+
+    assert load_cached_result("tool:v1", str(module), cache_dir=tmp_path / "cache") == {"loc": 1, "names": ["x"]}
+
+
+def test_changed_content_misses(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text("x = 1\n", encoding="utf-8")
+    store_cached_result("tool:v1", str(module), {"loc": 1}, cache_dir=tmp_path / "cache")
+
+    module.write_text("x = 1\ny = 2\n", encoding="utf-8")
+
+    assert load_cached_result("tool:v1", str(module), cache_dir=tmp_path / "cache") is None
+
+
+def test_changed_namespace_misses(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text("x = 1\n", encoding="utf-8")
+    store_cached_result("tool:v1", str(module), {"loc": 1}, cache_dir=tmp_path / "cache")
+
+    assert load_cached_result("tool:v2", str(module), cache_dir=tmp_path / "cache") is None
+
+
+def test_corrupt_or_unreadable_entry_returns_none(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text("x = 1\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    store_cached_result("tool:v1", str(module), {"loc": 1}, cache_dir=cache_dir)
+
+    (entry,) = (cache_dir / "tool").glob("*.json")
+    entry.write_text('{"loc": ', encoding="utf-8")
+    assert load_cached_result("tool:v1", str(module), cache_dir=cache_dir) is None
+
+    entry.unlink()
+    entry.mkdir()
+    assert load_cached_result("tool:v1", str(module), cache_dir=cache_dir) is None
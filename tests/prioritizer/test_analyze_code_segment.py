@@ -0,0 +1,84 @@
+import pytest
+
+from prioritizer.ingestion.smell import Smell
+from prioritizer.llm.analyze_code_segment import _SUMMARY_CACHE, _split_batch_response, analyze_code_segments_via_ai
+
+from mocking_objects.fake_llm import FakeLLM
+
+
+@pytest.fixture(autouse=True)
+def clear_summary_cache():
+    _SUMMARY_CACHE.clear()
+    yield
+    _SUMMARY_CACHE.clear()
+
+
+def make_smell(index, code, line_number=1):
+    return Smell(
+        index=index,
+        type_of_smell="Long Method",
+        name=f"f{index}",
+        file_path="mod.py",
+        line_number=line_number,
+        description="Method is too long.",
+        code_segment=code,
+    )
+
+
+def test_split_batch_response_handles_preamble_and_marker_variants():
+    text = (
+        "Sure, here are the summaries.\n"
+        "### SUMMARY 1\n"
+        "First summary.\n"
+        "\n"
+        "## SUMMARY 2\n"
+        "Second summary,\n"
+        "over two lines.\n"
+        "  ####  SUMMARY   3  \n"
+        "Third summary.\n"
+    )
+
+    assert _split_batch_response(text) == {
+        "1": "First summary.",
+        "2": "Second summary,\nover two lines.",
+        "3": "Third summary.",
+    }
+
+
+def test_split_batch_response_ignores_inline_and_single_hash_markers():
+    text = "# SUMMARY 1\nnot a marker\n### SUMMARY 2\nsee ### SUMMARY 3 inline\n"
+
+    assert _split_batch_response(text) == {"2": "see ### SUMMARY 3 inline"}
+
+
+def test_batch_mode_falls_back_to_single_call_for_missing_id():
+    smells = [make_smell(1, "def a(): pass", 1), make_smell(2, "def b(): pass", 2)]
+    llm = FakeLLM(
+        response_text="Single-call summary.",
+        batch_response_text="### SUMMARY 1\nBatched summary.\n",
+    )
+
+    analyze_code_segments_via_ai(smells, llm, batch_size=4)
+
+    assert smells[0].ai_code_segment_summary == "Batched summary."
+    assert smells[1].ai_code_segment_summary == "Single-call summary."
+    assert llm.invoke_count == 1
+    assert "def b(): pass" in llm.last_messages[1].content
+
+
+def test_batch_mode_shares_summary_between_identical_segments():
+    # 1 and 3 share a cache key, so only 1 is sent and 3 reuses its summary.
+    smells = [
+        make_smell(1, "def a(): pass", 1),
+        make_smell(2, "def b(): pass", 2),
+        make_smell(3, "def a(): pass", 1),
+    ]
+    llm = FakeLLM(
+        response_text="unused",
+        batch_response_text="### SUMMARY 2\nSummary of b.\n### SUMMARY 1\nSummary of a.\n",
+    )
+
+    analyze_code_segments_via_ai(smells, llm, batch_size=4)
+
+    assert [s.ai_code_segment_summary for s in smells] == ["Summary of a.", "Summary of b.", "Summary of a."]
+    assert llm.invoke_count == 0
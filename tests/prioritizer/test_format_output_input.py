@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import pytest
+
+from prioritizer.evaluation.evaluation import format_output_from_llm_to_csv_format
+
+LLM_TEXT = (
+    "Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization\n"
+    "1|10|Long Method|foo|foo.py|High|Too long\n"
+)
+
+
+def test_plain_text_reply_is_parsed_not_opened():
+    with pytest.raises(ValueError):
+        format_output_from_llm_to_csv_format("I could not produce a ranking.")
+
+
+def test_path_is_read_from_disk(tmp_path):
+    output = tmp_path / "output.csv"
+    output.write_text(LLM_TEXT, encoding="utf-8")
+
+    df = format_output_from_llm_to_csv_format(Path(output))
+
+    assert df.loc[0, "Name"] == "foo"
@@ -0,0 +1,39 @@
+from prioritizer.evaluation.evaluation import format_output_from_llm_to_csv_format, EXPECTED_COLS
+
+HEADER = "Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization\n"
+
+
+def test_unbalanced_quote_in_cell_is_parsed():
+    llm_text = HEADER + (
+        '1|10|Long Method|"foo|foo.py|High|Too long\n'
+        "2|11|Feature Envy|bar|bar.py|Medium|Envious\n"
+    )
+    df = format_output_from_llm_to_csv_format(llm_text)
+
+    assert list(df.columns) == EXPECTED_COLS
+    assert df.shape == (2, len(EXPECTED_COLS))
+    assert df.loc[0, "Name"] == '"foo'
+    assert df.loc[1, "Name"] == "bar"
+
+
+def test_embedded_quotes_in_reason_are_kept():
+    llm_text = HEADER + (
+        '1|10|Long Method|foo|foo.py|High|"Churn" is high\n'
+        '2|11|Feature Envy|bar|bar.py|Medium|says "hi" here\n'
+    )
+    df = format_output_from_llm_to_csv_format(llm_text)
+
+    assert df.loc[0, "Reason for Prioritization"] == '"Churn" is high'
+    assert df.loc[1, "Reason for Prioritization"] == 'says "hi" here'
+
+
+def test_stray_quotes_without_header_are_parsed():
+    llm_text = (
+        '1|10|Long Method|"foo|foo.py|High|x "y" z\n'
+        '2|11|Feature Envy|bar"|bar.py|Medium|Envious\n'
+    )
+    df = format_output_from_llm_to_csv_format(llm_text)
+
+    assert list(df.columns) == EXPECTED_COLS
+    assert df.loc[0, "Reason for Prioritization"] == 'x "y" z'
+    assert df.loc[1, "Name"] == 'bar"'
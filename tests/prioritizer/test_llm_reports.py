@@ -0,0 +1,117 @@
+import shutil
+
+from prioritizer.analysis import build_llm_analysis_report, build_llm_analysis_reports, invalidate_cached_file, llm_reports
+from prioritizer.analysis.analysis_cache import ANALYSIS_CACHE_DIR
+from prioritizer.analysis.llm_reports import _REPORT_CACHE
+from prioritizer.analysis.pylint_analysis import _PYLINT_RESULTS_CACHE
+from prioritizer.analysis.static_metrics import _FILE_METRICS_CACHE
+
+
+def test_report_is_rebuilt_after_file_edit(tmp_path, monkeypatch):
+    # The on-disk analysis cache lives under a relative path; keep it inside tmp_path.
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text("def f():\n    return 1\n", encoding="utf-8")
+
+    first = build_llm_analysis_report(str(module))
+    assert first["meta"]["loc"] == 2
+    assert first["meta"]["num_functions"] == 1
+
+    module.write_text(
+        "def f():\n    return 1\n\n\n"
+        "def g():\n    return 2\n\n\n"
+        "def h(x):\n    return x if x else 3\n",
+        encoding="utf-8",
+    )
+
+    second = build_llm_analysis_report(str(module))
+    assert second["meta"]["loc"] == 10
+    assert second["meta"]["num_functions"] == 3
+
+
+def test_unchanged_file_returns_cached_report(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text("def f():\n    return 1\n", encoding="utf-8")
+
+    assert build_llm_analysis_report(str(module)) is build_llm_analysis_report(str(module))
+
+
+def test_invalidate_cached_file_matches_relative_and_absolute_keys(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    edited = str(tmp_path / "edited.py")
+    other = str(tmp_path / "other.py")
+
+    for cache in (_FILE_METRICS_CACHE, _PYLINT_RESULTS_CACHE, _REPORT_CACHE):
+        cache["edited.py"] = "relative"
+        cache[edited] = "absolute"
+        cache["other.py"] = "relative"
+        cache[other] = "absolute"
+
+    try:
+        invalidate_cached_file(edited)
+        for cache in (_FILE_METRICS_CACHE, _PYLINT_RESULTS_CACHE, _REPORT_CACHE):
+            assert "edited.py" not in cache and edited not in cache
+            assert "other.py" in cache and other in cache
+
+        invalidate_cached_file("other.py")
+        for cache in (_FILE_METRICS_CACHE, _PYLINT_RESULTS_CACHE, _REPORT_CACHE):
+            assert "other.py" not in cache and other not in cache
+    finally:
+        for cache in (_FILE_METRICS_CACHE, _PYLINT_RESULTS_CACHE, _REPORT_CACHE):
+            cache.clear()
+
+
+def _write_modules(tmp_path, count):
+    paths = []
+    for i in range(count):
+        module = tmp_path / f"module{i}.py"
+        module.write_text(f"def f{i}(x):\n    return x if x else {i}\n", encoding="utf-8")
+        paths.append(str(module))
+    return paths
+
+
+def test_few_files_are_built_in_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = _write_modules(tmp_path, 3)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a handful of files must not start a process pool")
+
+    monkeypatch.setattr(llm_reports, "ProcessPoolExecutor", no_pool)
+
+    reports = build_llm_analysis_reports(paths, max_workers=4)
+
+    assert list(reports) == paths
+    assert all(_REPORT_CACHE[p][1] is reports[p] for p in paths)
+
+
+def test_reports_built_in_workers_fill_the_report_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(llm_reports, "_PARALLEL_MIN_FILES", 2)
+    monkeypatch.setattr(llm_reports, "_FILES_PER_TASK", 2)
+    paths = _write_modules(tmp_path, 4)
+
+    reports = build_llm_analysis_reports(paths, max_workers=2)
+
+    assert list(reports) == paths
+    # Later single-file calls are cache hits on the reports the workers returned.
+    assert all(build_llm_analysis_report(p) is reports[p] for p in paths)
+
+
+def test_parallel_reports_match_serial_reports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = _write_modules(tmp_path, 4)
+
+    serial = build_llm_analysis_reports(paths, max_workers=1)
+
+    # Cold caches, so the workers really analyze every file.
+    for path in paths:
+        invalidate_cached_file(path)
+    shutil.rmtree(ANALYSIS_CACHE_DIR)
+    monkeypatch.setattr(llm_reports, "_PARALLEL_MIN_FILES", 2)
+    monkeypatch.setattr(llm_reports, "_FILES_PER_TASK", 2)
+
+    parallel = build_llm_analysis_reports(paths, max_workers=2)
+
+    assert parallel == serial
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+from prioritizer.ingestion.smell import Smell
+from prioritizer.llm import ollama_client
+from prioritizer.llm.analyze_code_segment import _SUMMARY_CACHE, SUMMARY_SYSTEM_PROMPT, analyze_code_segments_via_ai
+from prioritizer.llm.ollama_client import OllamaGenerator
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def json(self):
+        return {"response": self.text}
+
+
+class FakeSession:
+    """Echoes the prompt back and records which thread owns the session."""
+
+    created = []
+
+    def __init__(self):
+        self.owner = threading.get_ident()
+        self.payloads = []
+        FakeSession.created.append(self)
+
+    def post(self, url, json):
+        assert threading.get_ident() == self.owner, "a session was shared across threads"
+        self.payloads.append(json)
+        return FakeResponse(f"summary of: {json['prompt'][-12:]}")
+
+    def close(self):
+        pass
+
+
+def _generator(monkeypatch):
+    FakeSession.created = []
+    monkeypatch.setattr(ollama_client.requests, "Session", FakeSession)
+    return OllamaGenerator(model="test", num_parallel=3)
+
+
+def test_run_batch_keeps_order_and_uses_a_session_per_thread(monkeypatch):
+    llm = _generator(monkeypatch)
+    prompts = [f"prompt number {i:03d}" for i in range(12)]
+
+    responses = llm.run_batch(prompts, system="be brief")["responses"]
+
+    assert responses == [f"summary of: {p[-12:]}" for p in prompts]
+    assert 1 <= len(FakeSession.created) <= 3
+    assert all(p["system"] == "be brief" for s in FakeSession.created for p in s.payloads)
+    llm.close()
+
+
+def test_run_batch_can_be_called_from_a_running_event_loop(monkeypatch):
+    llm = _generator(monkeypatch)
+
+    async def node():
+        return llm.run_batch(["a first prompt", "a second prompt"])["responses"]
+
+    assert asyncio.run(node()) == ["summary of: first prompt", "summary of: econd prompt"]
+    llm.close()
+
+
+def test_segment_summaries_go_through_run_batch(monkeypatch):
+    _SUMMARY_CACHE.clear()
+    llm = _generator(monkeypatch)
+    calls = []
+    run_batch = llm.run_batch
+
+    def recording_run_batch(prompts, system=None):
+        calls.append((len(prompts), system))
+        return run_batch(prompts, system=system)
+
+    monkeypatch.setattr(llm, "run_batch", recording_run_batch)
+    smells = [
+        Smell(index=i, type_of_smell="Long Method", name=f"f{i}", file_path="mod.py", line_number=i, code_segment=f"def f{i}(): pass")
+        for i in range(1, 5)
+    ]
+
+    analyze_code_segments_via_ai(smells, llm)
+
+    assert calls == [(4, SUMMARY_SYSTEM_PROMPT)]
+    assert all(s.ai_code_segment_summary.startswith("summary of: ") for s in smells)
+    _SUMMARY_CACHE.clear()
+    llm.close()
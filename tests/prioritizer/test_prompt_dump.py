@@ -0,0 +1,21 @@
+from prioritizer.llm.prompt_dump import dump_prompt_in_background, flush_prompt_dumps
+
+
+def test_latest_dump_wins(tmp_path):
+    target = tmp_path / "prompt.txt"
+
+    for i in range(50):
+        dump_prompt_in_background(target, f"prompt {i}\n" * 1000)
+    flush_prompt_dumps()
+
+    assert target.read_text(encoding="utf-8") == "prompt 49\n" * 1000
+    assert [p.name for p in tmp_path.iterdir()] == ["prompt.txt"]
+
+
+def test_dump_accepts_str_path(tmp_path):
+    target = tmp_path / "prompt.txt"
+
+    dump_prompt_in_background(str(target), "the prompt")
+    flush_prompt_dumps()
+
+    assert target.read_text(encoding="utf-8") == "the prompt"
@@ -0,0 +1,24 @@
+import pytest
+from haystack import Document
+from haystack.components.builders import PromptBuilder
+
+from prioritizer.llm.prompt_template import PROMPT_TEMPLATE, render_prompt
+
+SMELLS = [
+    Document(content="# SMELL\nId: 1\nName: SMELL A\n...x"),
+    Document(content="# SMELL\nId: 2\nName: SMELL B\n...y"),
+]
+DOCUMENTS = [
+    Document(content="Article chunk one."),
+    Document(content="Article chunk two."),
+]
+QUESTION = "Rank the smells."
+
+
+@pytest.mark.parametrize("documents", [DOCUMENTS, []])
+def test_render_prompt_matches_prompt_builder(documents):
+    expected = PromptBuilder(template=PROMPT_TEMPLATE).run(
+        smells=SMELLS, documents=documents, question=QUESTION
+    )["prompt"]
+
+    assert render_prompt(smells=SMELLS, documents=documents, question=QUESTION) == expected
@@ -0,0 +1,55 @@
+import shutil
+
+from prioritizer.analysis import pylint_analysis
+from prioritizer.analysis.analysis_cache import ANALYSIS_CACHE_DIR
+from prioritizer.analysis.pylint_analysis import get_pylint_metadata, get_pylint_metadata_batch, get_pylinter_singleton
+
+
+def _write_package(tmp_path):
+    (tmp_path / "helpers.py").write_text(
+        "import os\n\n\ndef join(a, b):\n    return os.path.join(a, b)\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "main.py").write_text(
+        "import helpers\n\n\ndef run(x):\n    unused = 1\n    return helpers.join(x, x)\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "other.py").write_text(
+        "import helpers\n\n\nclass thing:\n    def go(self):\n        return helpers.missing()\n",
+        encoding="utf-8",
+    )
+    return ["helpers.py", "main.py", "other.py"]
+
+
+def test_batch_matches_single_file_results(tmp_path, monkeypatch):
+    # The on-disk analysis cache lives under a relative path; keep it inside tmp_path.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pylint_analysis, "_PYLINT_RESULTS_CACHE", {})
+    paths = _write_package(tmp_path)
+    linter, reporter = get_pylinter_singleton()
+
+    single = {p: get_pylint_metadata(p, reporter, linter) for p in paths}
+
+    # Start the batch from cold caches so it really runs pylint.
+    monkeypatch.setattr(pylint_analysis, "_PYLINT_RESULTS_CACHE", {})
+    shutil.rmtree(ANALYSIS_CACHE_DIR)
+
+    batch = get_pylint_metadata_batch(paths, reporter, linter)
+
+    assert batch == single
+    # Inference into the imported module must work the same way in both modes.
+    assert single["other.py"][0]["error"] == 1
+
+
+def test_batch_reenables_cross_file_messages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pylint_analysis, "_PYLINT_RESULTS_CACHE", {})
+    paths = _write_package(tmp_path)
+    linter, reporter = get_pylinter_singleton()
+    assert linter.is_message_enabled("duplicate-code")
+    assert linter.is_message_enabled("cyclic-import")
+
+    get_pylint_metadata_batch(paths, reporter, linter)
+
+    assert linter.is_message_enabled("duplicate-code")
+    assert linter.is_message_enabled("cyclic-import")
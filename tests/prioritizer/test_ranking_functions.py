@@ -1,4 +1,3 @@
-from pathlib import Path
 import pytest
 
 from prioritizer.evaluation.evaluation import (
@@ -9,16 +8,13 @@ from prioritizer.evaluation.evaluation import (
     ranking_computation
 )
 
-def test_format_output_with_header(tmp_path: Path):
+def test_format_output_with_header():
     llm_text = """\
 Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization
 1|10|Long Method|foo|foo.py|High|Too long
 2|11|Feature Envy|bar|bar.py|Medium|Envious
 """
-    llm_file = tmp_path / "llm_output.txt"
-    llm_file.write_text(llm_text)
-
-    df = format_output_from_llm_to_csv_format(llm_file)
+    df = format_output_from_llm_to_csv_format(llm_text)
 
     assert list(df.columns) == EXPECTED_COLS
     assert df.shape == (2, len(EXPECTED_COLS))
@@ -26,23 +22,20 @@ Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization
     assert df.loc[1, "Name"] == "bar"
 
 
-def test_format_output_without_header(tmp_path: Path):
+def test_format_output_without_header():
     # LLM sometimes omits header; function should assign EXPECTED_COLS when column count matches.
     llm_text = """\
 1|7|Long File|alpha|alpha.py|Low|Large file
 2|8|Cyclic Dependency|beta|beta.py|High|Dependency cycle
 """
-    llm_file = tmp_path / "llm_output_no_header.txt"
-    llm_file.write_text(llm_text)
-
-    df = format_output_from_llm_to_csv_format(llm_file)
+    df = format_output_from_llm_to_csv_format(llm_text)
 
     assert list(df.columns) == EXPECTED_COLS
     assert df.loc[0, "Name of Smell"] == "Long File"
     assert df.loc[1, "File"] == "beta.py"
 
 
-def test_format_output_strips_markdown_fences(tmp_path: Path):
+def test_format_output_strips_markdown_fences():
     llm_text = """\
 Some intro text
 ```markdown
@@ -50,10 +43,7 @@ Rank|Id|Name of Smell|Name|File|Severity|Reason for Prioritization
 1|1|Long Method|foo|foo.py|High|Because
 ```
 """
-    llm_file = tmp_path / "llm_with_fence.txt"
-    llm_file.write_text(llm_text)
-
-    df = format_output_from_llm_to_csv_format(llm_file)
+    df = format_output_from_llm_to_csv_format(llm_text)
 
     assert df.loc[0, "Rank"] == 1
     assert df.loc[0, "Name"] == "foo"
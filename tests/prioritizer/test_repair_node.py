@@ -1,8 +1,10 @@
+import asyncio
 import pytest
 from pathlib import Path
 
 from prioritizer.pipelines.agentic.repair_node import repair_output_node
 from prioritizer.pipelines.agentic.reviewing_output import EXPECTED_HEADER
+from prioritizer.ingestion.smell import Smell
 
 from mocking_objects.fake_llm import FakeLLM
 
@@ -27,7 +29,10 @@ def make_state_for_repair(llm, smells, output_text, errors, attempts=0, max_atte
     }
 
 def test_repair_node_increments_attempts_and_replaces_output():
-    smells = [{"index": "14"}, {"index": "20"}]
+    smells = [
+        Smell(index=14, type_of_smell="Feature Envy", name="a", file_path="f.py"),
+        Smell(index=20, type_of_smell="Feature Envy", name="b", file_path="g.py"),
+    ]
     errors = {"Invalid header format": "Header is wrong."}
     prior = "BAD OUTPUT"
 
@@ -40,7 +45,7 @@ def test_repair_node_increments_attempts_and_replaces_output():
     llm = FakeLLM(response_text=fixed_output)
     state = make_state_for_repair(llm, smells, prior, errors)
 
-    out = repair_output_node(state)
+    out = asyncio.run(repair_output_node(state))
 
     assert out["repair_attempts"] == 1
     assert out["output_text"].startswith(EXPECTED_HEADER)
@@ -1,7 +1,7 @@
 import pytest
 from typing import List, Dict, Any
 
-from prioritizer.pipelines.agentic.reviewing_output import review_output_node
+from prioritizer.pipelines.agentic.reviewing_output import review_output_node, review_output_batch
 
 from mocking_objects.mock_states import (
     make_mock_state, 
@@ -40,9 +40,40 @@ def _assert_has_error_keys(out: Dict[str, Any], expected_keys: List[str]):
         (FAULTY_RANKS, ["Invalid rank ordering"]),
 
         (FAULTY_EXTRA_TEXT, ["Invalid header format"]),
+
+        ("I am sorry, I cannot rank these smells.", ["Invalid header format", "Incorrect number of rows"]),
     ],
 )
 def test_faulty_outputs_detected(output_text, expected_keys):
     state = make_mock_state(output_text, MOCK_SMELLS)
     out = review_output_node(state)
-    _assert_has_error_keys(out, expected_keys)
\ No newline at end of file
+    _assert_has_error_keys(out, expected_keys)
+
+def test_review_output_batch_matches_single_reviews():
+    outputs = [CORRECT_OUTPUT, FAULTY_NO_HEADER, FAULTY_DUPLICATE_ID, FAULTY_SEVERITY_ORDER, FAULTY_RANKS]
+    states = [make_mock_state(text, MOCK_SMELLS) for text in outputs]
+
+    batch = review_output_batch(states)
+
+    assert len(batch) == len(states)
+    for state, out in zip(states, batch):
+        assert out == review_output_node(state)
+
+def test_unchanged_output_is_not_revalidated():
+    state = make_mock_state(FAULTY_NO_HEADER, MOCK_SMELLS)
+    state.update(review_output_node(state))
+
+    assert review_output_node(state) == {}
+
+    state["output_text"] = CORRECT_OUTPUT
+    out = review_output_node(state)
+    assert out["is_valid"] is True
+
+def test_truncated_table_without_header_gets_row_level_errors():
+    # Two headerless rows for ten smells: still a table, so the repair prompt must
+    # hear about the missing ids and ranks, not that there is no table at all.
+    state = make_mock_state(FAULTY_NO_HEADER, MOCK_SMELLS)
+    out = review_output_node(state)
+
+    _assert_has_error_keys(out, ["Invalid header format", "Incorrect number of rows", "Missing smell identifiers", "Invalid rank ordering"])
+    assert "pipe-separated table" not in out["validation_errors"]["Incorrect number of rows"]
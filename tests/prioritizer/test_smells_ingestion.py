@@ -10,6 +10,6 @@ def test_add_further_context():
     assert smells_dic is not None
 
     output = add_further_context(project_path, smells_dic)
-    assert output[1]["git_analysis"] is not None
+    assert output[1].git_analysis is not None
 
 
@@ -0,0 +1,45 @@
+import statistics
+
+import pytest
+import radon.metrics as radon_metrics
+
+from prioritizer.analysis import analyze_file
+
+
+def _function_with_complexity(name: str, complexity: int) -> str:
+    branches = "".join(f"    if x == {i}:\n        return {i}\n" for i in range(complexity - 1))
+    return f"def {name}(x):\n{branches}    return -1\n\n\n"
+
+
+def test_average_complexity_is_exact(tmp_path, monkeypatch):
+    # A running (Welford) mean comes out one ulp below 10 for these complexities.
+    complexities = [25, 19, 11, 2, 14, 12, 3, 5, 12, 19, 2, 9, 4, 10, 12, 1]
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text(
+        "".join(_function_with_complexity(f"f{i}", cc) for i, cc in enumerate(complexities)),
+        encoding="utf-8",
+    )
+
+    meta = analyze_file(str(module))
+
+    assert meta["avg_cc"] == 10.0
+    assert meta["max_cc"] == 25
+    assert abs(meta["cc_std"] - statistics.pstdev(complexities)) < 1e-9
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "x = dict(a=1,\n b=2); y = 3\n",
+        's = """a\nb"""; t = 1\n',
+    ],
+)
+def test_statement_starting_on_previous_statement_end_line(tmp_path, monkeypatch, source):
+    monkeypatch.chdir(tmp_path)
+    module = tmp_path / "module.py"
+    module.write_text(source, encoding="utf-8")
+
+    meta = analyze_file(str(module))
+
+    assert meta["maintainability_index"] == radon_metrics.mi_visit(source, True)